@@ -17,12 +17,14 @@ import networkx as nx
 from seiz_models import SEIZBMModel, SEIZModel, SEIZSMModel
 
 
-def animate_basic_seiz():
-    """Create animation for basic SEIZ model."""
-    print("Creating animation for Basic SEIZ Model...")
+def animate_basic_seiz(G):
+    """
+    Create animation for basic SEIZ model.
 
-    # Create a small network for better visualization
-    G = nx.watts_strogatz_graph(n=50, k=4, p=0.1, seed=42)
+    Args:
+        G: Small network shared by the examples (not modified)
+    """
+    print("Creating animation for Basic SEIZ Model...")
 
     # Initialize model
     model = SEIZModel(graph=G, beta=0.6, b=0.3, rho=0.2, eps=0.05, p=0.4, l=0.6, dt=1.0)
@@ -85,12 +87,14 @@ def animate_seiz_bm():
     return model
 
 
-def animate_seiz_sm():
-    """Create animation for SEIZ-SM model."""
-    print("\nCreating animation for SEIZ-SM Model...")
+def animate_seiz_sm(G):
+    """
+    Create animation for SEIZ-SM model.
 
-    # Create network
-    G = nx.watts_strogatz_graph(n=50, k=4, p=0.1, seed=42)
+    Args:
+        G: Small network shared by the examples (not modified)
+    """
+    print("\nCreating animation for SEIZ-SM Model...")
 
     # Initialize smart moderator model
     model = SEIZSMModel(
@@ -130,12 +134,16 @@ def main():
     print("Close each animation window to proceed to the next.")
     print()
 
+    # Create a small network for better visualization, shared by the
+    # examples that animate the same topology
+    G = nx.watts_strogatz_graph(n=50, k=4, p=0.1, seed=42)
+
     # Run animations
-    model1 = animate_basic_seiz()
+    model1 = animate_basic_seiz(G)
 
     # Uncomment to see other models
     # model2 = animate_seiz_bm()
-    # model3 = animate_seiz_sm()
+    # model3 = animate_seiz_sm(G)
 
     print()
     print("=" * 60)
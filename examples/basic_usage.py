@@ -2,6 +2,8 @@
 Basic usage example for SEIZ epidemic models.
 
 This script demonstrates how to use all three models and compare their results.
+The three simulations are independent, so they run in parallel processes when
+joblib is installed (pip install joblib), and sequentially otherwise.
 """
 
 import sys
@@ -15,34 +17,86 @@ import networkx as nx
 
 from seiz_models import SEIZBMModel, SEIZModel, SEIZSMModel
 
+try:
+    from joblib import Parallel, delayed
+except ImportError:
+    Parallel = None
+
+MODELS = {
+    "SEIZModel": SEIZModel,
+    "SEIZBMModel": SEIZBMModel,
+    "SEIZSMModel": SEIZSMModel,
+}
+
+
+def run_one(params_dict):
+    """
+    Run a single simulation described by a dictionary.
+
+    This is the unit of work for parameter sweeps, e.g.
+    ``Parallel(n_jobs=-1)(delayed(run_one)(d) for d in configs)``.
+
+    Args:
+        params_dict: Dictionary with keys ``model`` (class name), ``params``
+            (model parameters), and optionally ``n``, ``k``, ``p_rewire``,
+            ``graph_seed`` (Watts-Strogatz network), ``infected_frac``,
+            ``skeptic_frac``, ``seed``, ``steps`` and ``output`` (JSON path)
+
+    Returns:
+        List of state count dictionaries for each step
+    """
+    G = nx.watts_strogatz_graph(
+        n=params_dict.get("n", 200),
+        k=params_dict.get("k", 6),
+        p=params_dict.get("p_rewire", 0.1),
+        seed=params_dict.get("graph_seed", 42),
+    )
+    model = MODELS[params_dict["model"]](graph=G, **params_dict["params"])
+    model.initialize_states(
+        infected_frac=params_dict.get("infected_frac", 0.05),
+        skeptic_frac=params_dict.get("skeptic_frac", 0.05),
+        seed=params_dict.get("seed"),
+    )
+    history = model.run(steps=params_dict.get("steps", 100))
 
-def run_basic_seiz():
-    """Run basic SEIZ model."""
-    print("Running Basic SEIZ Model...")
+    if params_dict.get("output"):
+        model.save_json(params_dict["output"])
+
+    return history
 
-    # Create network
-    G = nx.watts_strogatz_graph(n=200, k=6, p=0.1, seed=42)
+
+def run_basic_seiz(G):
+    """
+    Run basic SEIZ model.
+
+    Args:
+        G: Social network shared by all examples (read only)
+    """
+    print("Running Basic SEIZ Model...")
 
     # Initialize model
     model = SEIZModel(graph=G, beta=0.6, b=0.3, rho=0.2, eps=0.05, p=0.4, l=0.6, dt=1.0)
 
     # Run simulation
     model.initialize_states(infected_frac=0.05, skeptic_frac=0.05, seed=123)
-    history = model.run(steps=100)
+    model.run(steps=100)
 
     # Save results
     model.save_json("seiz_basic_results.json")
     print(f"  Final state: {model.count_states()}")
 
-    return history
+    return model.history_array()
 
 
-def run_seiz_bm():
-    """Run SEIZ-BM (Basic Moderator) model."""
-    print("Running SEIZ-BM Model...")
+def run_seiz_bm(G):
+    """
+    Run SEIZ-BM (Basic Moderator) model.
 
-    # Create network
-    G = nx.watts_strogatz_graph(n=200, k=6, p=0.1, seed=42)
+    Args:
+        G: Social network shared by all examples; the model attaches its
+            agents to the nodes (node attribute "agent")
+    """
+    print("Running SEIZ-BM Model...")
 
     # Initialize model
     model = SEIZBMModel(
@@ -51,21 +105,24 @@ def run_seiz_bm():
 
     # Run simulation
     model.initialize_states(infected_frac=0.05, skeptic_frac=0.05, seed=123)
-    history = model.run(steps=100)
+    model.run(steps=100)
 
     # Save results
     model.save_json("seiz_bm_results.json")
     print(f"  Final state: {model.count_states()}")
 
-    return history
+    return model.history_array()
 
 
-def run_seiz_sm():
-    """Run SEIZ-SM (Smart Moderator) model."""
-    print("Running SEIZ-SM Model...")
+def run_seiz_sm(G):
+    """
+    Run SEIZ-SM (Smart Moderator) model.
 
-    # Create network
-    G = nx.watts_strogatz_graph(n=200, k=6, p=0.1, seed=42)
+    Args:
+        G: Social network shared by all examples; the model attaches its
+            agents to the nodes (node attribute "agent")
+    """
+    print("Running SEIZ-SM Model...")
 
     # Initialize model
     model = SEIZSMModel(
@@ -85,13 +142,13 @@ def run_seiz_sm():
 
     # Run simulation
     model.initialize_states(infected_frac=0.05, skeptic_frac=0.05, seed=123)
-    history = model.run(steps=100)
+    model.run(steps=100)
 
     # Save results
     model.save_json("seiz_sm_results.json")
     print(f"  Final state: {model.count_states()}")
 
-    return history
+    return model.history_array()
 
 
 def compare_models(hist_basic, hist_bm, hist_sm):
@@ -108,16 +165,10 @@ def compare_models(hist_basic, hist_bm, hist_sm):
     ]
 
     for history, title, ax in models:
-        steps = [h["step"] for h in history]
-        s_counts = [h["S"] for h in history]
-        e_counts = [h["E"] for h in history]
-        i_counts = [h["I"] for h in history]
-        z_counts = [h["Z"] for h in history]
-
-        ax.plot(steps, s_counts, label="S", color="blue", linewidth=2)
-        ax.plot(steps, e_counts, label="E", color="orange", linewidth=2)
-        ax.plot(steps, i_counts, label="I", color="red", linewidth=2)
-        ax.plot(steps, z_counts, label="Z", color="green", linewidth=2)
+        ax.plot(history["step"], history["S"], label="S", color="blue", linewidth=2)
+        ax.plot(history["step"], history["E"], label="E", color="orange", linewidth=2)
+        ax.plot(history["step"], history["I"], label="I", color="red", linewidth=2)
+        ax.plot(history["step"], history["Z"], label="Z", color="green", linewidth=2)
 
         ax.set_xlabel("Time Steps")
         ax.set_ylabel("Number of Agents")
@@ -127,27 +178,25 @@ def compare_models(hist_basic, hist_bm, hist_sm):
 
     # Comparison of infected over time
     ax = axes[1, 1]
-    steps = [h["step"] for h in hist_basic]
-
     ax.plot(
-        steps,
-        [h["I"] for h in hist_basic],
+        hist_basic["step"],
+        hist_basic["I"],
         label="Basic SEIZ",
         color="red",
         linewidth=2,
         linestyle="-",
     )
     ax.plot(
-        steps,
-        [h["I"] for h in hist_bm],
+        hist_bm["step"],
+        hist_bm["I"],
         label="SEIZ-BM",
         color="orange",
         linewidth=2,
         linestyle="--",
     )
     ax.plot(
-        steps,
-        [h["I"] for h in hist_sm],
+        hist_sm["step"],
+        hist_sm["I"],
         label="SEIZ-SM",
         color="purple",
         linewidth=2,
@@ -173,10 +222,19 @@ def main():
     print("=" * 60)
     print()
 
-    # Run all three models
-    hist_basic = run_basic_seiz()
-    hist_bm = run_seiz_bm()
-    hist_sm = run_seiz_sm()
+    # Create the network once; every model freezes it at construction and
+    # none of them changes its structure (SEIZ-BM and SEIZ-SM only attach
+    # their agents as node attributes)
+    G = nx.watts_strogatz_graph(n=200, k=6, p=0.1, seed=42)
+
+    # Run all three models (independent, so in parallel when possible)
+    runners = (run_basic_seiz, run_seiz_bm, run_seiz_sm)
+    if Parallel is not None:
+        hist_basic, hist_bm, hist_sm = Parallel(n_jobs=3, backend="loky")(
+            delayed(run)(G) for run in runners
+        )
+    else:
+        hist_basic, hist_bm, hist_sm = (run(G) for run in runners)
 
     # Compare results
     compare_models(hist_basic, hist_bm, hist_sm)
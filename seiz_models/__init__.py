@@ -10,10 +10,16 @@ Models:
     - SEIZSMModel: SEIZ with Smart Moderator
 """
 
-from .base import BaseEpidemicModel
-from .seiz import SEIZModel
-from .seiz_bm import SEIZBMModel
-from .seiz_sm import SEIZSMModel
+import importlib
+
+# Models are imported lazily on first access (PEP 562), so that scripts
+# only pay for the modules they actually use.
+_LAZY_IMPORTS = {
+    "BaseEpidemicModel": ".base",
+    "SEIZModel": ".seiz",
+    "SEIZBMModel": ".seiz_bm",
+    "SEIZSMModel": ".seiz_sm",
+}
 
 __all__ = [
     "BaseEpidemicModel",
@@ -23,3 +29,14 @@ __all__ = [
 ]
 
 __version__ = "0.1.0"
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
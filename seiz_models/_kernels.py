@@ -0,0 +1,454 @@
+"""
+Compiled simulation kernels.
+
+This module holds the Numba-compiled inner loops used by the array-backed
+models. Numba is an optional dependency: when it is not installed,
+``NUMBA_AVAILABLE`` is False and the models fall back to their NumPy code
+paths. Kernels are compiled lazily on their first call, so importing the
+package stays cheap.
+
+Kernels draw their random numbers from the NumPy generator passed to them
+(the model's own ``_rng``), so compiled and NumPy steps share one random
+stream per model.
+"""
+
+import numpy as np
+
+from .base import E_CODE, I_CODE, S_CODE, Z_CODE
+
+try:
+    from numba import njit, prange
+    from numba.typed import List
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - exercised only without numba
+    NUMBA_AVAILABLE = False
+    prange = range
+    List = list
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+def replicate_generators(seeds):
+    """
+    Build one NumPy generator per seed, in a list the ensemble kernels accept.
+
+    Args:
+        seeds: Random seeds, one per replicate
+
+    Returns:
+        List of ``np.random.Generator``, one per seed
+    """
+    return List([np.random.default_rng(seed) for seed in seeds])
+
+
+@njit(cache=True)
+def _propose(proposed, counts, node, code, rng):
+    """Record a proposal, keeping a uniformly random one per node (reservoir)."""
+    counts[node] += 1
+    if counts[node] == 1 or rng.random() < 1.0 / counts[node]:
+        proposed[node] = code
+
+
+@njit(cache=True)
+def seiz_step(
+    indptr,
+    indices,
+    states,
+    proposed,
+    counts,
+    prob_contact_I,
+    prob_contact_Z,
+    prob_E_to_I,
+    prob_I_to_E,
+    p_to_I,
+    p_to_Z,
+    rng,
+):
+    """
+    Execute one synchronous SEIZ step in place.
+
+    Args:
+        indptr: CSR row pointers
+        indices: CSR column indices
+        states: int8 state codes, updated in place
+        proposed: int8 scratch buffer of length N
+        counts: int64 scratch buffer of length N
+        prob_contact_I: Per-step S-I contact probability
+        prob_contact_Z: Per-step S-Z contact probability
+        prob_E_to_I: Per-step E -> I probability
+        prob_I_to_E: Per-step I -> E probability
+        p_to_I: Per-step probability of an S-I contact leading to S -> I
+        p_to_Z: Per-step probability of an S-Z contact leading to S -> Z
+        rng: NumPy generator supplying the random draws
+    """
+    n = states.shape[0]
+    proposed[:] = -1
+    counts[:] = 0
+
+    for i in range(n):
+        state = states[i]
+        if state == I_CODE:
+            for k in range(indptr[i], indptr[i + 1]):
+                j = indices[k]
+                if states[j] == S_CODE:
+                    # One draw samples contact and outcome together
+                    u = rng.random()
+                    if u < p_to_I:
+                        _propose(proposed, counts, j, I_CODE, rng)
+                    elif u < prob_contact_I:
+                        _propose(proposed, counts, j, E_CODE, rng)
+            if rng.random() < prob_I_to_E:
+                _propose(proposed, counts, i, E_CODE, rng)
+        elif state == Z_CODE:
+            for k in range(indptr[i], indptr[i + 1]):
+                j = indices[k]
+                if states[j] == S_CODE:
+                    u = rng.random()
+                    if u < p_to_Z:
+                        _propose(proposed, counts, j, Z_CODE, rng)
+                    elif u < prob_contact_Z:
+                        _propose(proposed, counts, j, E_CODE, rng)
+        elif state == E_CODE:
+            if rng.random() < prob_E_to_I:
+                _propose(proposed, counts, i, I_CODE, rng)
+
+    for i in range(n):
+        if proposed[i] >= 0:
+            states[i] = proposed[i]
+
+
+@njit(cache=True)
+def seiz_sm_step(
+    indptr,
+    indices,
+    states,
+    toxic_profile,
+    p_expose,
+    toxic_messages,
+    activity,
+    pool,
+    n_s,
+    n_e,
+    n_messages,
+    theta,
+    beta,
+    p,
+    rho,
+    epsilon,
+    lambd,
+    rng,
+):
+    """
+    Execute one SEIZ-SM step (messages, moderation, spread, E transitions) in place.
+
+    Args:
+        indptr: CSR row pointers
+        indices: CSR column indices
+        states: int8 state codes, updated in place
+        toxic_profile: Whether each agent's toxicity reaches the threshold T
+        p_expose: Probability I -> E once moderated, per agent
+        toxic_messages: int32 toxic message counters, updated in place
+        activity: int32 activity counters, updated in place
+        pool: Permutation of the node indices, reordered in place
+        n_s: Number of S agents before the step
+        n_e: Number of E agents before the step
+        n_messages: Number of messages sent (distinct senders)
+        theta: Toxic message threshold for intervention
+        beta: S-I contact rate
+        p: Probability S -> I after contact with I
+        rho: E-I contact rate
+        epsilon: Incubation rate E -> I
+        lambd: Probability E -> Z (and I -> Z after moderation)
+        rng: NumPy generator supplying the random draws
+
+    Returns:
+        Tuple (n_s, n_e) with the number of S and E agents after the step
+    """
+    n = states.shape[0]
+    toxic_senders = np.empty(n_messages, dtype=np.int64)
+
+    # --- Messages and moderation; toxic senders are kept in sender order ---
+    n_toxic = 0
+    for k in range(n_messages):
+        # Partial Fisher-Yates: distinct senders in O(n_messages)
+        r = rng.integers(k, n)
+        i = pool[r]
+        pool[r] = pool[k]
+        pool[k] = i
+        activity[i] += 1
+        if states[i] == I_CODE and toxic_profile[i]:
+            toxic_messages[i] += 1
+            expose = rng.random() < p_expose[i]
+            skeptic = rng.random() < lambd
+            if toxic_messages[i] >= theta:
+                if expose:
+                    states[i] = E_CODE
+                    toxic_messages[i] = 0
+                    n_e += 1
+                elif skeptic:
+                    states[i] = Z_CODE
+                    toxic_messages[i] = 0
+            toxic_senders[n_toxic] = i
+            n_toxic += 1
+
+    # --- Spread: messages are delivered in sender order ---
+    if n_s > 0 or n_e > 0:
+        for k in range(n_toxic):
+            i = toxic_senders[k]
+            for m in range(indptr[i], indptr[i + 1]):
+                j = indices[m]
+                u_contact = rng.random()
+                u_outcome = rng.random()
+                if states[j] == S_CODE:
+                    if u_contact < beta:
+                        n_s -= 1
+                        if u_outcome < p:
+                            states[j] = I_CODE
+                        else:
+                            states[j] = E_CODE
+                            n_e += 1
+                elif states[j] == E_CODE and u_contact < rho:
+                    states[j] = I_CODE
+                    n_e -= 1
+
+    # --- Internal transitions E -> I, E -> Z ---
+    if n_e > 0:
+        for i in range(n):
+            if states[i] == E_CODE:
+                if rng.random() < epsilon:
+                    states[i] = I_CODE
+                    n_e -= 1
+                elif rng.random() < lambd:
+                    states[i] = Z_CODE
+                    n_e -= 1
+
+    return n_s, n_e
+
+
+@njit(cache=True)
+def seiz_bm_step(
+    indptr, indices, states, new_states, contact_prob, adopt_prob, rho, epsilon, p_moderate, rng
+):
+    """
+    Execute one synchronous SEIZ-BM step into a shadow array.
+
+    The new states are written to ``new_states``, which the caller swaps with
+    ``states`` afterwards, so no copy is needed.
+
+    Args:
+        indptr: CSR row pointers
+        indices: CSR column indices
+        states: int8 state codes, read only
+        new_states: int8 buffer of length N, receives the new state codes
+        contact_prob: Contact probability of an S agent, by neighbor state
+        adopt_prob: Probability S -> neighbor state after contact, by neighbor state
+        rho: Probability E -> I per infected neighbor contact
+        epsilon: Incubation probability E -> I
+        p_moderate: Probability of successful moderation I -> S
+        rng: NumPy generator supplying the random draws
+    """
+    n = states.shape[0]
+
+    for i in range(n):
+        state = states[i]
+        new_states[i] = state
+        if state == S_CODE:
+            # The first neighbor whose contact succeeds decides the outcome
+            for k in range(indptr[i], indptr[i + 1]):
+                nb_state = states[indices[k]]
+                prob = contact_prob[nb_state]
+                if prob > 0.0 and rng.random() < prob:
+                    if rng.random() < adopt_prob[nb_state]:
+                        new_states[i] = nb_state
+                    else:
+                        new_states[i] = E_CODE
+                    break
+        elif state == E_CODE:
+            if rng.random() < epsilon:
+                new_states[i] = I_CODE
+            else:
+                for k in range(indptr[i], indptr[i + 1]):
+                    if states[indices[k]] == I_CODE and rng.random() < rho:
+                        new_states[i] = I_CODE
+                        break
+        elif state == I_CODE:
+            if rng.random() < p_moderate:
+                new_states[i] = S_CODE
+
+
+@njit(cache=True)
+def _count_states(states, out):
+    """Write the number of agents in each state into ``out``."""
+    out[:] = 0
+    for i in range(states.shape[0]):
+        out[states[i]] += 1
+
+
+@njit(parallel=True, cache=True)
+def seiz_bm_ensemble(
+    indptr,
+    indices,
+    rngs,
+    n_infected,
+    n_skeptic,
+    steps,
+    contact_prob,
+    adopt_prob,
+    rho,
+    epsilon,
+    p_moderate,
+):
+    """
+    Run independent SEIZ-BM replicates in parallel, one per generator.
+
+    Every replicate allocates its own state arrays inside the parallel loop
+    and draws from its own generator, so threads never share mutable state
+    and results do not depend on scheduling.
+
+    Args:
+        indptr: CSR row pointers
+        indices: CSR column indices
+        rngs: NumPy generator of each replicate (see ``replicate_generators``)
+        n_infected: Number of initially infected agents
+        n_skeptic: Number of initially skeptic agents
+        steps: Number of simulation steps
+        contact_prob: Contact probability of an S agent, by neighbor state
+        adopt_prob: Probability S -> neighbor state after contact, by neighbor state
+        rho: Probability E -> I per infected neighbor contact
+        epsilon: Incubation probability E -> I
+        p_moderate: Probability of successful moderation I -> S
+
+    Returns:
+        int32 array of shape (len(rngs), steps + 1, 4) with the S, E, I, Z
+        counts of every replicate and step
+    """
+    n = indptr.shape[0] - 1
+    history = np.zeros((len(rngs), steps + 1, 4), dtype=np.int32)
+
+    for r in prange(len(rngs)):
+        # The parallel loop index is unsigned; typed lists take signed indices
+        rng = rngs[np.int64(r)]
+        states = np.full(n, S_CODE, dtype=np.int8)
+        new_states = np.empty(n, dtype=np.int8)
+
+        order = rng.permutation(n)
+        states[order[:n_infected]] = I_CODE
+        states[order[n_infected : n_infected + n_skeptic]] = Z_CODE
+
+        _count_states(states, history[r, 0])
+        for t in range(steps):
+            seiz_bm_step(
+                indptr,
+                indices,
+                states,
+                new_states,
+                contact_prob,
+                adopt_prob,
+                rho,
+                epsilon,
+                p_moderate,
+                rng,
+            )
+            states, new_states = new_states, states
+            _count_states(states, history[r, t + 1])
+
+    return history
+
+
+@njit(parallel=True, cache=True)
+def seiz_sm_ensemble(
+    indptr,
+    indices,
+    rngs,
+    n_infected,
+    n_skeptic,
+    steps,
+    n_messages,
+    theta,
+    T,
+    beta,
+    p,
+    rho,
+    epsilon,
+    eta,
+    lambd,
+):
+    """
+    Run independent SEIZ-SM replicates in parallel, one per generator.
+
+    Every replicate draws its own profiles and allocates its own state and
+    counter arrays inside the parallel loop, and draws from its own
+    generator, so results do not depend on scheduling.
+
+    Args:
+        indptr: CSR row pointers
+        indices: CSR column indices
+        rngs: NumPy generator of each replicate (see ``replicate_generators``)
+        n_infected: Number of initially infected agents
+        n_skeptic: Number of initially skeptic agents
+        steps: Number of simulation steps
+        n_messages: Number of messages sent per step (distinct senders)
+        theta: Toxic message threshold for intervention
+        T: Toxicity probability threshold
+        beta: S-I contact rate
+        p: Probability S -> I after contact with I
+        rho: E-I contact rate
+        epsilon: Incubation rate E -> I
+        eta: Probability I -> E after moderation
+        lambd: Probability E -> Z (and I -> Z after moderation)
+
+    Returns:
+        int32 array of shape (len(rngs), steps + 1, 4) with the S, E, I, Z
+        counts of every replicate and step
+    """
+    n = indptr.shape[0] - 1
+    history = np.zeros((len(rngs), steps + 1, 4), dtype=np.int32)
+
+    for r in prange(len(rngs)):
+        # The parallel loop index is unsigned; typed lists take signed indices
+        rng = rngs[np.int64(r)]
+        states = np.full(n, S_CODE, dtype=np.int8)
+        order = rng.permutation(n)
+        states[order[:n_infected]] = I_CODE
+        states[order[n_infected : n_infected + n_skeptic]] = Z_CODE
+
+        # Toxicity is the mean of the three Dark Triad traits
+        toxicity = rng.random((n, 3)).sum(axis=1) / 3.0
+        toxic_profile = toxicity >= T
+        p_expose = eta * (1.0 - toxicity)
+        toxic_messages = np.zeros(n, dtype=np.int32)
+        activity = np.zeros(n, dtype=np.int32)
+        pool = np.arange(n)
+
+        n_s = n - n_infected - n_skeptic
+        n_e = 0
+        _count_states(states, history[r, 0])
+        for t in range(steps):
+            n_s, n_e = seiz_sm_step(
+                indptr,
+                indices,
+                states,
+                toxic_profile,
+                p_expose,
+                toxic_messages,
+                activity,
+                pool,
+                n_s,
+                n_e,
+                n_messages,
+                theta,
+                beta,
+                p,
+                rho,
+                epsilon,
+                lambd,
+                rng,
+            )
+            _count_states(states, history[r, t + 1])
+
+    return history
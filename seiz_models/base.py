@@ -8,9 +8,136 @@ for all SEIZ epidemic models.
 import json
 from abc import ABC, abstractmethod
 from collections import Counter
-from typing import Any, Dict, List, Optional
+from contextlib import contextmanager
+from itertools import chain
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-import matplotlib.pyplot as plt
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+# Integer codes used by array-backed models to store agent states
+S_CODE, E_CODE, I_CODE, Z_CODE = 0, 1, 2, 3
+STATE_LABELS = ("S", "E", "I", "Z")
+
+# Record layout of a simulation history as a structured array
+HISTORY_DTYPE = np.dtype([("step", "i4"), ("S", "i4"), ("E", "i4"), ("I", "i4"), ("Z", "i4")])
+
+
+def _index_dtype(size: int) -> np.dtype:
+    """
+    Smallest integer type for CSR entries up to ``size``.
+
+    int32 halves the memory traffic of the neighbor tables; int64 is only
+    needed beyond 2**31 - 1 nodes or edge slots.
+
+    Args:
+        size: Largest value to store
+
+    Returns:
+        np.int32 or np.int64
+    """
+    return np.dtype(np.int32) if size <= np.iinfo(np.int32).max else np.dtype(np.int64)
+
+
+def _graph_to_csr(
+    graph, nodelist: List[Any], node_idx: Dict[Any, int]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build the CSR adjacency (indptr, indices) of a graph.
+
+    Row i lists the integer ids of the neighbors of ``nodelist[i]``, in the
+    same order as ``graph.neighbors``.
+
+    Args:
+        graph: networkx.Graph - Social network of agents
+        nodelist: Nodes in index order
+        node_idx: Mapping node -> integer index
+
+    Returns:
+        Tuple (indptr, indices) of int32 arrays, or int64 for very large graphs
+    """
+    # Read the plain neighbor dicts once, bypassing the per-node graph views
+    adjacency = dict(graph.adjacency())
+    rows = [adjacency[node] for node in nodelist]
+
+    degrees = np.fromiter(map(len, rows), dtype=np.int64, count=len(rows))
+    n_slots = int(degrees.sum())
+    indptr = np.zeros(len(nodelist) + 1, dtype=_index_dtype(n_slots))
+    np.cumsum(degrees, out=indptr[1:])
+    indices = np.fromiter(
+        map(node_idx.__getitem__, chain.from_iterable(rows)),
+        dtype=_index_dtype(len(nodelist)),
+        count=n_slots,
+    )
+    return indptr, indices
+
+
+def _csr_to_graph(indptr: np.ndarray, indices: np.ndarray):
+    """
+    Build the undirected NetworkX graph of a CSR adjacency.
+
+    Args:
+        indptr: CSR row pointers
+        indices: CSR column indices
+
+    Returns:
+        networkx.Graph with nodes 0..N-1
+    """
+    import networkx as nx
+
+    n = len(indptr) - 1
+    graph = nx.Graph()
+    graph.add_nodes_from(range(n))
+    owners = np.repeat(np.arange(n), np.diff(indptr))
+    graph.add_edges_from(zip(owners.tolist(), indices.tolist()))
+    return graph
+
+
+def _json_default(obj: Any) -> Any:
+    """
+    Encode the NumPy values json cannot, e.g. np.float32 model parameters.
+
+    Args:
+        obj: Object the JSON encoder does not support
+
+    Returns:
+        Equivalent built-in Python value
+    """
+    if isinstance(obj, (np.generic, np.ndarray)):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def derived_param(name: str) -> property:
+    """
+    Build a model parameter that lookup tables or caches are derived from.
+
+    The value is stored in ``_<name>``. The first assignment (in
+    ``__init__``) only stores it; later assignments also call the model's
+    ``_update_derived``, so the derived tables follow the parameter.
+
+    Args:
+        name: Public parameter name
+
+    Returns:
+        Property to bind to ``name`` in the model class
+    """
+    attr = "_" + name
+
+    def fget(self):
+        return getattr(self, attr)
+
+    def fset(self, value):
+        initialized = hasattr(self, attr)
+        setattr(self, attr, value)
+        if initialized:
+            self._update_derived()
+
+    return property(fget, fset, doc=f"Model parameter {name} (setting it refreshes derived tables)")
 
 
 class BaseEpidemicModel(ABC):
@@ -23,6 +150,12 @@ class BaseEpidemicModel(ABC):
     - Step-wise execution
     - JSON output
     - Visualization
+
+    The graph is frozen into integer-indexed arrays at construction and must
+    not be mutated afterwards; to simulate on a modified network, create a
+    new model. A prebuilt CSR adjacency ``(indptr, indices)`` can be passed
+    instead of a NetworkX graph, in which case the nodes are 0..N-1 and the
+    NetworkX graph is only built if ``graph`` is accessed (e.g. to plot).
     """
 
     def __init__(self, graph, **params):
@@ -30,14 +163,117 @@ class BaseEpidemicModel(ABC):
         Initialize the model.
 
         Args:
-            graph: networkx.Graph - Social network of agents
+            graph: networkx.Graph - Social network of agents, or its CSR
+                adjacency (indptr, indices) with nodes 0..N-1
             **params: Model-specific parameters
         """
-        self.graph = graph
+        self._graph = graph if not isinstance(graph, tuple) else None
+        if self._graph is None:
+            indptr, indices = graph
+            self._indptr = np.ascontiguousarray(indptr, dtype=_index_dtype(len(indices)))
+            self._indices = np.ascontiguousarray(indices, dtype=_index_dtype(len(indptr) - 1))
         self.params = params
-        self.history = []
+        self._freeze_graph()
+        self._history_arr = np.empty(0, dtype=HISTORY_DTYPE)
+        self._history_list = None
         self._current_step = 0
 
+    def _freeze_graph(self) -> None:
+        """
+        Capture the network structure as integer-indexed arrays.
+
+        Stores the node count, node list (index -> node), node index mapping,
+        edge count, node degrees, the mask of agents with at least one
+        neighbor and the CSR adjacency used by the simulation hot paths.
+        """
+        if self._graph is None:
+            # CSR input: nodes are the indices; a self-loop appears once in its row
+            self._N = len(self._indptr) - 1
+            self._nodes = list(range(self._N))
+            self._node_idx = {node: node for node in self._nodes}
+            owners = np.repeat(np.arange(self._N), np.diff(self._indptr))
+            self_loops = np.count_nonzero(owners == self._indices)
+            self._num_edges = int(self._indices.size + self_loops) // 2
+        else:
+            self._nodes = list(self._graph.nodes())
+            self._node_idx = {node: i for i, node in enumerate(self._nodes)}
+            self._N = len(self._nodes)
+            self._num_edges = self._graph.number_of_edges()
+            self._indptr, self._indices = _graph_to_csr(self._graph, self._nodes, self._node_idx)
+        # Degrees feed np.repeat and cumulative sums, which work on intp counts
+        self._degree = np.diff(self._indptr).astype(np.intp)
+        # Isolated agents can be skipped before any neighbor gather
+        self._connected = self._degree > 0
+
+    @property
+    def graph(self):
+        """Social network (networkx.Graph), built on first access for CSR input."""
+        if self._graph is None:
+            self._graph = _csr_to_graph(self._indptr, self._indices)
+            self._decorate_graph(self._graph)
+        return self._graph
+
+    def _decorate_graph(self, graph) -> None:
+        """
+        Attach per-node model attributes to the graph.
+
+        Called by models once their agents exist, and when the graph of a
+        CSR input is built. The base implementation attaches nothing.
+
+        Args:
+            graph: networkx.Graph of the model
+        """
+
+    def _update_derived(self) -> None:
+        """
+        Recompute the tables and caches derived from the model parameters.
+
+        Called when a parameter declared with ``derived_param`` is set after
+        construction. The base implementation derives nothing.
+        """
+
+    def _edge_slots(self, sources: np.ndarray) -> np.ndarray:
+        """
+        Flat CSR positions of the edges leaving a set of agents.
+
+        Args:
+            sources: Node indices
+
+        Returns:
+            Positions into the CSR ``indices`` array, grouped by source in the
+            order of ``sources`` and in adjacency order within each source
+        """
+        # Each source contributes indptr[s], ..., indptr[s] + degree[s] - 1
+        degree = self._degree[sources]
+        shift = self._indptr[sources] - (np.cumsum(degree) - degree)
+        return np.repeat(shift, degree) + np.arange(degree.sum())
+
+    def _neighbors_of(self, sources: np.ndarray) -> np.ndarray:
+        """
+        Gather the neighbors of a set of agents, one entry per edge.
+
+        Args:
+            sources: Node indices
+
+        Returns:
+            Neighbor node indices, in the order given by ``_edge_slots``
+        """
+        return self._indices[self._edge_slots(sources)]
+
+    def _edges_from(self, sources: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Gather the edges leaving a set of agents, with their owners.
+
+        Args:
+            sources: Node indices
+
+        Returns:
+            Tuple (owners, neighbors) of node indices, one entry per edge, in
+            the order given by ``_edge_slots``
+        """
+        owners = np.repeat(sources, self._degree[sources])
+        return owners, self._indices[self._edge_slots(sources)]
+
     @abstractmethod
     def initialize_states(
         self, infected_frac: float = 0.05, skeptic_frac: float = 0.05, seed: Optional[int] = None
@@ -82,6 +318,36 @@ class BaseEpidemicModel(ABC):
                 counts[state] = 0
         return dict(counts)
 
+    def _count_codes(self) -> np.ndarray:
+        """
+        Count the number of agents in each state, by state code.
+
+        Returns:
+            Integer array with the S, E, I, Z counts
+        """
+        counts = self.count_states()
+        return np.array([counts[label] for label in STATE_LABELS])
+
+    @property
+    def history(self) -> List[Dict[str, int]]:
+        """
+        Simulation history as a list of state count dictionaries.
+
+        The history is stored as a structured array (see ``history_array``);
+        this list view is built on first access.
+        """
+        if self._history_list is None:
+            names = HISTORY_DTYPE.names
+            self._history_list = [dict(zip(names, row)) for row in self._history_arr.tolist()]
+        return self._history_list
+
+    @history.setter
+    def history(self, value: List[Dict[str, int]]) -> None:
+        self._history_arr = np.array(
+            [(h["step"], h["S"], h["E"], h["I"], h["Z"]) for h in value], dtype=HISTORY_DTYPE
+        )
+        self._history_list = None
+
     def run(self, steps: int = 100) -> List[Dict[str, int]]:
         """
         Run the simulation for a specified number of steps.
@@ -92,51 +358,112 @@ class BaseEpidemicModel(ABC):
         Returns:
             List of state count dictionaries for each step
         """
-        self.history = []
-        for step in range(steps):
-            self._current_step = step
-            counts = self.count_states()
-            counts["step"] = step
-            self.history.append(counts)
-            self.step()
-
-        # Record final state
-        counts = self.count_states()
-        counts["step"] = steps
-        self.history.append(counts)
-
+        self._simulate(steps)
         return self.history
 
-    def to_json(self, indent: int = 2) -> str:
+    def _simulate(self, steps: int) -> None:
         """
-        Export simulation results to JSON format.
+        Run the simulation, recording the history array only.
+
+        Unlike ``run``, the list-of-dicts history view is not built, which
+        matters for long runs whose results are read as arrays.
 
         Args:
-            indent: JSON indentation level
+            steps: Number of simulation steps
+        """
+        history = np.empty(steps + 1, dtype=HISTORY_DTYPE)
+        for step in range(steps + 1):
+            history[step] = (step, *self._count_codes().tolist())
+            if step < steps:
+                self._current_step = step
+                self.step()
+
+        self._history_arr = history
+        self._history_list = None
+
+    def history_array(self) -> np.ndarray:
+        """
+        Get the simulation history as a structured NumPy array.
 
         Returns:
-            JSON string with model parameters and history
+            Array with one record per step and fields step, S, E, I, Z
+        """
+        return self._history_arr
+
+    def _json_header(self) -> Dict[str, Any]:
         """
-        output = {
+        Get the metadata section of the JSON export.
+
+        Returns:
+            Dictionary with model type, parameters and network info
+        """
+        return {
             "model_type": self.__class__.__name__,
             "parameters": self.params,
             "network_info": {
-                "num_nodes": self.graph.number_of_nodes(),
-                "num_edges": self.graph.number_of_edges(),
+                "num_nodes": self._N,
+                "num_edges": self._num_edges,
             },
-            "history": self.history,
         }
-        return json.dumps(output, indent=indent)
 
-    def save_json(self, filepath: str) -> None:
+    def to_json(self, indent: int = 2) -> str:
+        """
+        Export simulation results to JSON format.
+
+        When orjson is installed and the layout is the default two-space one,
+        the history is encoded with it. The history holds integers only, so
+        the output is the same as the standard library's; the header, whose
+        parameters may be floats, always goes through ``json``.
+
+        Args:
+            indent: JSON indentation level
+
+        Returns:
+            JSON string with model parameters and history
+        """
+        if orjson is not None and indent == 2:
+            header = json.dumps(self._json_header(), indent=2, default=_json_default)
+            history = orjson.dumps(self.history, option=orjson.OPT_INDENT_2).decode()
+            # Nest the history one level deep inside the reopened header object
+            return header[:-2] + ',\n  "history": ' + history.replace("\n", "\n  ") + "\n}"
+
+        output = self._json_header()
+        output["history"] = self.history
+        return json.dumps(output, indent=indent, default=_json_default)
+
+    def save_json(self, filepath: str, compact: bool = True) -> None:
         """
         Save simulation results to a JSON file.
 
+        The history is streamed to the file one step at a time instead of
+        being serialized as a single string. The indented layout is identical
+        to the output of ``to_json()``.
+
         Args:
             filepath: Path to output JSON file
+            compact: Whether to write compact JSON; if False, write the
+                     indented layout of ``to_json()``
         """
+        names = HISTORY_DTYPE.names
+        if compact:
+            header = json.dumps(self._json_header(), default=_json_default)
+            fields = ", ".join(f'"{name}": %d' for name in names)
+            row_format, first_sep, sep, close = "{" + fields + "}", "", ", ", "]}"
+        else:
+            header = json.dumps(self._json_header(), indent=2, default=_json_default)
+            fields = ",\n".join(f'      "{name}": %d' for name in names)
+            row_format = "{\n" + fields + "\n    }"
+            first_sep, sep, close = "\n    ", ",\n    ", "\n  ]\n}"
+        rows = self._history_arr.tolist()
+
         with open(filepath, "w") as f:
-            f.write(self.to_json())
+            # Reopen the header object to append the history member
+            f.write(header[:-1].rstrip())
+            f.write(', "history": [' if compact else ',\n  "history": [')
+            for i, row in enumerate(rows):
+                f.write(sep if i else first_sep)
+                f.write(row_format % row)
+            f.write(close if rows else close.lstrip())
 
     def plot(self, title: Optional[str] = None, figsize: tuple = (10, 6)) -> None:
         """
@@ -146,23 +473,21 @@ class BaseEpidemicModel(ABC):
             title: Plot title (uses model name if not provided)
             figsize: Figure size (width, height)
         """
-        if not self.history:
+        import matplotlib.pyplot as plt
+
+        if len(self._history_arr) == 0:
             raise ValueError("No history to plot. Run the simulation first.")
 
         if title is None:
             title = f"{self.__class__.__name__} Dynamics"
 
-        steps = [h["step"] for h in self.history]
-        s_counts = [h["S"] for h in self.history]
-        e_counts = [h["E"] for h in self.history]
-        i_counts = [h["I"] for h in self.history]
-        z_counts = [h["Z"] for h in self.history]
+        arr = self.history_array()
 
         plt.figure(figsize=figsize)
-        plt.plot(steps, s_counts, label="Susceptible (S)", color="blue", linewidth=2)
-        plt.plot(steps, e_counts, label="Exposed (E)", color="orange", linewidth=2)
-        plt.plot(steps, i_counts, label="Infected (I)", color="red", linewidth=2)
-        plt.plot(steps, z_counts, label="Skeptic (Z)", color="green", linewidth=2)
+        plt.plot(arr["step"], arr["S"], label="Susceptible (S)", color="blue", linewidth=2)
+        plt.plot(arr["step"], arr["E"], label="Exposed (E)", color="orange", linewidth=2)
+        plt.plot(arr["step"], arr["I"], label="Infected (I)", color="red", linewidth=2)
+        plt.plot(arr["step"], arr["Z"], label="Skeptic (Z)", color="green", linewidth=2)
 
         plt.xlabel("Time Steps", fontsize=12)
         plt.ylabel("Number of Agents", fontsize=12)
@@ -184,23 +509,21 @@ class BaseEpidemicModel(ABC):
             figsize: Figure size (width, height)
             dpi: Resolution in dots per inch
         """
-        if not self.history:
+        import matplotlib.pyplot as plt
+
+        if len(self._history_arr) == 0:
             raise ValueError("No history to plot. Run the simulation first.")
 
         if title is None:
             title = f"{self.__class__.__name__} Dynamics"
 
-        steps = [h["step"] for h in self.history]
-        s_counts = [h["S"] for h in self.history]
-        e_counts = [h["E"] for h in self.history]
-        i_counts = [h["I"] for h in self.history]
-        z_counts = [h["Z"] for h in self.history]
+        arr = self.history_array()
 
         plt.figure(figsize=figsize)
-        plt.plot(steps, s_counts, label="Susceptible (S)", color="blue", linewidth=2)
-        plt.plot(steps, e_counts, label="Exposed (E)", color="orange", linewidth=2)
-        plt.plot(steps, i_counts, label="Infected (I)", color="red", linewidth=2)
-        plt.plot(steps, z_counts, label="Skeptic (Z)", color="green", linewidth=2)
+        plt.plot(arr["step"], arr["S"], label="Susceptible (S)", color="blue", linewidth=2)
+        plt.plot(arr["step"], arr["E"], label="Exposed (E)", color="orange", linewidth=2)
+        plt.plot(arr["step"], arr["I"], label="Infected (I)", color="red", linewidth=2)
+        plt.plot(arr["step"], arr["Z"], label="Skeptic (Z)", color="green", linewidth=2)
 
         plt.xlabel("Time Steps", fontsize=12)
         plt.ylabel("Number of Agents", fontsize=12)
@@ -220,6 +543,7 @@ class BaseEpidemicModel(ABC):
         figsize: tuple = (8, 8),
         node_size: int = 100,
         seed: Optional[int] = None,
+        precompute: bool = True,
     ) -> Any:
         """
         Generate an animation of the epidemic spreading over the network.
@@ -228,18 +552,30 @@ class BaseEpidemicModel(ABC):
         over time on the network structure. Nodes are colored according to their
         state: blue (S), orange (E), red (I), green (Z).
 
+        By default the simulation is run first and the recorded frames are
+        rendered once and played back with ArtistAnimation. With
+        ``precompute=False`` the simulation advances while the animation
+        plays, using FuncAnimation.
+
+        The recorded history is never modified. In precompute mode the agent
+        states are checkpointed and restored after the frames are recorded;
+        with ``precompute=False`` the animation advances the model like
+        ``step()`` does, so call ``run()`` first if you also need the
+        recorded history of that trajectory.
+
         Args:
             steps: Number of simulation steps to animate
             interval: Delay between frames in milliseconds
             repeat: Whether to loop the animation
             save_path: Optional path to save animation as MP4 or GIF file
-                      (requires ffmpeg for MP4, pillow for GIF)
+                      (requires ffmpeg for MP4, imageio or pillow for GIF)
             figsize: Figure size (width, height)
             node_size: Size of nodes in the visualization
             seed: Random seed for layout reproducibility
+            precompute: Whether to record all frames before rendering
 
         Returns:
-            matplotlib.animation.FuncAnimation object
+            matplotlib.animation.ArtistAnimation (or FuncAnimation) object
 
         Example:
             >>> model.initialize_states(infected_frac=0.05, seed=42)
@@ -247,8 +583,9 @@ class BaseEpidemicModel(ABC):
             >>> # To save: model.animate_network(steps=50, save_path='diffusion.mp4')
         """
         try:
+            import matplotlib.pyplot as plt
             import networkx as nx
-            from matplotlib.animation import FuncAnimation
+            from matplotlib.animation import ArtistAnimation, FuncAnimation
         except ImportError as e:
             raise ImportError(
                 "Animation requires networkx and matplotlib. "
@@ -262,11 +599,15 @@ class BaseEpidemicModel(ABC):
                 "States must be initialized before animation. " "Call initialize_states() first."
             )
 
-        # Store original history to restore after animation
-        original_history = self.history.copy()
+        if save_path and not save_path.endswith((".gif", ".mp4")):
+            raise ValueError("save_path must end with .gif or .mp4")
 
         # Compute layout once for consistency
+        node_list = self._nodes
         pos = nx.spring_layout(self.graph, seed=seed)
+        # Node positions as a contiguous array in node index order; frames
+        # reuse it and never touch the layout dictionary again
+        xy = np.array([pos[node] for node in node_list], dtype=np.float32)
 
         # Create figure and axis
         fig, ax = plt.subplots(figsize=figsize)
@@ -278,83 +619,356 @@ class BaseEpidemicModel(ABC):
             "I": "#d62728",  # red
             "Z": "#2ca02c",  # green
         }
-
-        def update(frame):
-            """Update function for animation."""
-            ax.clear()
-
-            # Execute one simulation step
-            if frame > 0:
-                self.step()
-
-            # Get current states and map to colors
-            states = self.get_states()
-            node_colors = [state_colors.get(states[node], "#cccccc") for node in self.graph.nodes()]
-
-            # Count states for display
-            counts = self.count_states()
-
-            # Draw network
-            nx.draw(
-                self.graph,
-                pos,
-                node_color=node_colors,
-                node_size=node_size,
-                with_labels=False,
-                ax=ax,
-                edge_color="#cccccc",
-                width=0.5,
+        palette = np.array([state_colors[label] for label in STATE_LABELS])
+
+        # Draw the static elements (edges, legend) once; frames only change
+        # the node colors and the title text, which lets matplotlib blit.
+        nx.draw_networkx_edges(self.graph, pos, ax=ax, edge_color="#cccccc", width=0.5)
+        ax.set_axis_off()
+
+        from matplotlib.patches import Patch
+
+        legend_elements = [
+            Patch(facecolor=state_colors["S"], label="Susceptible"),
+            Patch(facecolor=state_colors["E"], label="Exposed"),
+            Patch(facecolor=state_colors["I"], label="Infected"),
+            Patch(facecolor=state_colors["Z"], label="Skeptic"),
+        ]
+        ax.legend(handles=legend_elements, loc="upper right", fontsize=8)
+
+        if precompute:
+            with self._preserve_state():
+                frames = self._record_frames(steps)
+            artists = self._render(ax, frames, xy, node_size, palette)
+
+            def update(frame):
+                """Show the prerendered artists of one frame."""
+                for i, frame_artists in enumerate(artists):
+                    for artist in frame_artists:
+                        artist.set_visible(i == frame)
+                return artists[frame]
+
+        else:
+            nodes_artist = ax.scatter(
+                xy[:, 0], xy[:, 1], c=palette[self._state_codes()], s=node_size, zorder=2
             )
-
-            # Add title with state counts
-            title = f"{self.__class__.__name__} - Step {frame}\n"
-            title += f"S: {counts['S']}, E: {counts['E']}, I: {counts['I']}, Z: {counts['Z']}"
-            ax.set_title(title, fontsize=12, fontweight="bold")
-
-            # Add legend
-            from matplotlib.patches import Patch
-
-            legend_elements = [
-                Patch(facecolor=state_colors["S"], label="Susceptible"),
-                Patch(facecolor=state_colors["E"], label="Exposed"),
-                Patch(facecolor=state_colors["I"], label="Infected"),
-                Patch(facecolor=state_colors["Z"], label="Skeptic"),
-            ]
-            ax.legend(handles=legend_elements, loc="upper right", fontsize=8)
-
-            return (ax,)
+            title_artist = self._add_frame_title(ax, "")
+
+            def update(frame):
+                """Update function for animation."""
+                # Execute one simulation step
+                if frame > 0:
+                    self.step()
+
+                # Recolor nodes according to their current state
+                nodes_artist.set_facecolors(palette[self._state_codes()])
+
+                # Update title with state counts
+                title_artist.set_text(self._frame_title(frame, self.count_states()))
+
+                return nodes_artist, title_artist
+
+        # With imageio, GIF frames are streamed straight from the canvas
+        # before the animation takes over the artists for blitting
+        gif_streamed = False
+        if save_path and save_path.endswith(".gif"):
+            try:
+                import imageio.v3 as iio
+            except ImportError:
+                iio = None
+            if iio is not None:
+                gif_streamed = True
+                try:
+                    self._write_gif(iio, fig, update, steps + 1, save_path, interval)
+                    print(f"Animation saved to {save_path}")
+                except Exception as e:
+                    print(f"Warning: Could not save GIF. Error: {e}")
 
         # Create animation
-        anim = FuncAnimation(
-            fig,
-            update,
-            frames=steps + 1,  # +1 to include initial state
-            interval=interval,
-            repeat=repeat,
-            blit=False,
-        )
+        if precompute:
+            anim = ArtistAnimation(fig, artists, interval=interval, repeat=repeat, blit=True)
+        else:
+            anim = FuncAnimation(
+                fig,
+                update,
+                frames=steps + 1,  # +1 to include initial state
+                interval=interval,
+                repeat=repeat,
+                blit=True,
+            )
 
         # Save animation if path provided
-        if save_path:
+        if save_path and not gif_streamed:
             if save_path.endswith(".gif"):
                 try:
                     anim.save(save_path, writer="pillow", fps=1000 // interval)
                     print(f"Animation saved to {save_path}")
                 except Exception as e:
                     print(f"Warning: Could not save GIF. Error: {e}")
-                    print("Install pillow with: pip install pillow")
-            elif save_path.endswith(".mp4"):
+                    print("Install imageio or pillow with: pip install imageio pillow")
+            else:
                 try:
                     anim.save(save_path, writer="ffmpeg", fps=1000 // interval, dpi=100)
                     print(f"Animation saved to {save_path}")
                 except Exception as e:
                     print(f"Warning: Could not save MP4. Error: {e}")
                     print("Install ffmpeg or use .gif format instead")
-            else:
-                raise ValueError("save_path must end with .gif or .mp4")
-
-        # Restore original history
-        self.history = original_history
 
         plt.tight_layout()
         return anim
+
+    def _state_codes(self) -> np.ndarray:
+        """
+        Get the current state codes of all agents.
+
+        Returns:
+            int8 array of state codes, in node index order
+        """
+        states = self.get_states()
+        codes = {label: code for code, label in enumerate(STATE_LABELS)}
+        return np.array([codes[states[node]] for node in self._nodes], dtype=np.int8)
+
+    def _checkpoint(self) -> Any:
+        """
+        Capture the mutable simulation state.
+
+        Models that cannot checkpoint their state return None, in which case
+        ``_preserve_state`` leaves the state advanced.
+
+        Returns:
+            Opaque snapshot passed back to ``_restore_checkpoint``
+        """
+        return None
+
+    def _restore_checkpoint(self, checkpoint: Any) -> None:
+        """
+        Restore a snapshot taken by ``_checkpoint``.
+
+        Args:
+            checkpoint: Snapshot returned by ``_checkpoint``
+        """
+        pass
+
+    @contextmanager
+    def _preserve_state(self) -> Iterator[None]:
+        """
+        Run a block of simulation steps and then roll the model back.
+
+        Only the agent states and the step counter are saved, not the history.
+        """
+        checkpoint = self._checkpoint()
+        current_step = self._current_step
+        try:
+            yield
+        finally:
+            if checkpoint is not None:
+                self._restore_checkpoint(checkpoint)
+            self._current_step = current_step
+
+    def _record_frames(self, steps: int) -> List[np.ndarray]:
+        """
+        Run the simulation and record the state codes after every step.
+
+        Args:
+            steps: Number of simulation steps
+
+        Returns:
+            List of steps + 1 state code arrays (the first is the initial state)
+        """
+        frames = [self._state_codes()]
+        for _ in range(steps):
+            self.step()
+            frames.append(self._state_codes())
+        return frames
+
+    def _render(
+        self, ax, frames: List[np.ndarray], xy: np.ndarray, node_size: int, palette: np.ndarray
+    ) -> List[Tuple[Any, Any]]:
+        """
+        Build the node and title artists of every recorded frame.
+
+        Args:
+            ax: Axes to draw on
+            frames: State code arrays, one per frame
+            xy: float32 node positions, shape (N, 2)
+            node_size: Size of nodes in the visualization
+            palette: Color of each state code
+
+        Returns:
+            List of (nodes, title) artist pairs, one per frame
+        """
+        x, y = xy[:, 0], xy[:, 1]
+        artists = []
+        for frame, codes in enumerate(frames):
+            nodes = ax.scatter(x, y, c=palette[codes], s=node_size, zorder=2)
+            counts = np.bincount(codes, minlength=len(STATE_LABELS))
+            title = self._add_frame_title(
+                ax, self._frame_title(frame, dict(zip(STATE_LABELS, counts.tolist())))
+            )
+            artists.append((nodes, title))
+        return artists
+
+    def _frame_title(self, frame: int, counts: Dict[str, int]) -> str:
+        """Title of an animation frame, with the state counts."""
+        title = f"{self.__class__.__name__} - Step {frame}\n"
+        title += f"S: {counts['S']}, E: {counts['E']}, I: {counts['I']}, Z: {counts['Z']}"
+        return title
+
+    @staticmethod
+    def _add_frame_title(ax, text: str) -> Any:
+        """Add a frame title inside the axes, so it is part of the blitted region."""
+        return ax.text(
+            0.5,
+            1.0,
+            text,
+            transform=ax.transAxes,
+            ha="center",
+            va="top",
+            fontsize=12,
+            fontweight="bold",
+        )
+
+    @staticmethod
+    def _write_gif(iio, fig, update, n_frames: int, save_path: str, interval: int) -> None:
+        """
+        Stream animation frames from the Agg canvas into a GIF file.
+
+        Args:
+            iio: The imageio.v3 module
+            fig: Figure holding the animation
+            update: Frame update function
+            n_frames: Number of frames to write
+            save_path: Path to output GIF file
+            interval: Delay between frames in milliseconds
+        """
+        with iio.imopen(save_path, "w", plugin="pillow") as writer:
+            for frame in range(n_frames):
+                update(frame)
+                fig.canvas.draw()
+                rgb = np.array(fig.canvas.buffer_rgba())[..., :3]
+                writer.write(rgb, duration=interval, loop=0)
+
+
+class ArrayEpidemicModel(BaseEpidemicModel):
+    """
+    Base class for models that store agent states in an int8 array.
+
+    States are kept as integer codes (S_CODE, E_CODE, I_CODE, Z_CODE) in
+    ``_state_arr``, indexed like the frozen CSR adjacency, and random numbers
+    come from a NumPy generator. Subclasses only implement ``step``.
+    """
+
+    def __init__(self, graph, **params):
+        """
+        Initialize the model.
+
+        Args:
+            graph: networkx.Graph - Social network of agents
+            **params: Model-specific parameters
+        """
+        super().__init__(graph, **params)
+        self._state_arr = np.full(self._N, S_CODE, dtype=np.int8)
+        self._rng = np.random.default_rng()
+
+    @property
+    def states(self) -> Dict[Any, str]:
+        """Mapping node -> state, decoded from the internal state array."""
+        return {
+            node: STATE_LABELS[code] for node, code in zip(self._nodes, self._state_arr.tolist())
+        }
+
+    @property
+    def state_array(self) -> np.ndarray:
+        """
+        Read-only view of the int8 state codes, in node index order.
+
+        Codes index ``STATE_LABELS``. Models may swap their state buffers
+        when stepping, so take a new view after each step.
+        """
+        view = self._state_arr.view()
+        view.flags.writeable = False
+        return view
+
+    def initialize_states(
+        self, infected_frac: float = 0.05, skeptic_frac: float = 0.05, seed: Optional[int] = None
+    ) -> None:
+        """
+        Initialize agent states.
+
+        Args:
+            infected_frac: Fraction of initially infected agents
+            skeptic_frac: Fraction of initially skeptic agents
+            seed: Random seed for reproducibility
+        """
+        if seed is not None:
+            self._rng = np.random.default_rng(seed)
+
+        n = self._N
+        n_infected = int(n * infected_frac)
+        n_skeptic = int(n * skeptic_frac)
+
+        # Draw only the seeded agents, without shuffling the whole population
+        seeds = self._rng.choice(n, size=n_infected + n_skeptic, replace=False)
+
+        # Reset all to susceptible
+        self._state_arr[:] = S_CODE
+
+        # Set infected
+        self._state_arr[seeds[:n_infected]] = I_CODE
+
+        # Set skeptics
+        self._state_arr[seeds[n_infected:]] = Z_CODE
+
+    def get_states(self) -> Dict[Any, str]:
+        """
+        Get current states of all agents.
+
+        Returns:
+            Dictionary mapping node -> state
+        """
+        return self.states
+
+    def count_states(self) -> Dict[str, int]:
+        """
+        Count the number of agents in each state.
+
+        Returns:
+            Dictionary with counts for each state (S, E, I, Z)
+        """
+        return dict(zip(STATE_LABELS, self._count_codes().tolist()))
+
+    def _count_codes(self) -> np.ndarray:
+        """
+        Count the number of agents in each state, by state code.
+
+        Returns:
+            Integer array with the S, E, I, Z counts
+        """
+        return np.bincount(self._state_arr, minlength=len(STATE_LABELS))
+
+    def _state_codes(self) -> np.ndarray:
+        """
+        Get the current state codes of all agents.
+
+        Returns:
+            Copy of the int8 state array
+        """
+        return self._state_arr.copy()
+
+    def _checkpoint(self) -> np.ndarray:
+        """
+        Capture the mutable simulation state.
+
+        Returns:
+            Copy of the int8 state array
+        """
+        return self._state_arr.copy()
+
+    def _restore_checkpoint(self, checkpoint: np.ndarray) -> None:
+        """
+        Restore a snapshot taken by ``_checkpoint``.
+
+        Args:
+            checkpoint: State array returned by ``_checkpoint``
+        """
+        self._state_arr[:] = checkpoint
@@ -5,13 +5,13 @@ This module implements the basic SEIZ model without any moderation mechanisms.
 """
 
 import math
-import random
-from collections import defaultdict
-from typing import Any, Dict, Optional
+from typing import Tuple, Union
 
 import networkx as nx
+import numpy as np
 
-from .base import BaseEpidemicModel
+from ._kernels import NUMBA_AVAILABLE, seiz_step
+from .base import E_CODE, I_CODE, S_CODE, Z_CODE, ArrayEpidemicModel, derived_param
 
 
 def rate_to_prob(rate: float, dt: float) -> float:
@@ -19,7 +19,7 @@ def rate_to_prob(rate: float, dt: float) -> float:
     return 1 - math.exp(-rate * dt)
 
 
-class SEIZModel(BaseEpidemicModel):
+class SEIZModel(ArrayEpidemicModel):
     """
     Basic SEIZ epidemic model on a social network.
 
@@ -37,11 +37,22 @@ class SEIZModel(BaseEpidemicModel):
         p: Probability S -> I after contact with I
         l: Probability S -> Z after contact with Z
         dt: Time step size for rate conversion (default: 1.0)
+
+    When Numba is installed, steps run through a compiled kernel; set
+    ``use_jit = False`` on an instance to force the NumPy implementation.
     """
 
+    # Parameters of the per-step lookup tables, refreshed when one is set
+    p = derived_param("p")
+    l = derived_param("l")
+    prob_contact_I = derived_param("prob_contact_I")
+    prob_contact_Z = derived_param("prob_contact_Z")
+    prob_E_to_I = derived_param("prob_E_to_I")
+    prob_I_to_E = derived_param("prob_I_to_E")
+
     def __init__(
         self,
-        graph: nx.Graph,
+        graph: Union[nx.Graph, Tuple[np.ndarray, np.ndarray]],
         beta: float,
         b: float,
         rho: float,
@@ -54,7 +65,8 @@ class SEIZModel(BaseEpidemicModel):
         Initialize the SEIZ model.
 
         Args:
-            graph: Social network (NetworkX graph)
+            graph: Social network (NetworkX graph), or its CSR adjacency
+                (indptr, indices) with nodes 0..N-1
             beta: S-I contact rate
             b: S-Z contact rate
             rho: E -> I transition rate
@@ -79,86 +91,136 @@ class SEIZModel(BaseEpidemicModel):
         self.prob_contact_Z = rate_to_prob(b, dt)
         self.prob_E_to_I = rate_to_prob(rho, dt)
         self.prob_I_to_E = rate_to_prob(eps, dt)
+        self._update_derived()
+
+        # Target state of the internal progressions (E -> I, I -> E), by state
+        self._internal_target = np.array([S_CODE, I_CODE, E_CODE, Z_CODE], dtype=np.int8)
+
+        # Compiled kernel (optional); both step paths share the scratch buffers
+        self.use_jit = NUMBA_AVAILABLE
+        self._proposed = np.empty(self._N, dtype=np.int8)
+        self._proposal_counts = np.empty(self._N, dtype=np.int64)
+
+    def _update_derived(self) -> None:
+        """Recompute the per-step lookup tables from the model parameters."""
+        # Joint contact-and-convert probabilities: one uniform u per edge
+        # decides both tests (u < _p_to_I -> I, u < prob_contact_I -> E)
+        self._p_to_I = self.prob_contact_I * self.p
+        self._p_to_Z = self.prob_contact_Z * self.l
 
-        # Initialize states dictionary
-        self.states = {}
-        for node in self.graph.nodes():
-            self.states[node] = "S"
+        # Per-state probabilities of the internal progressions (E -> I, I -> E)
+        self._internal_prob = np.array([0.0, self.prob_E_to_I, self.prob_I_to_E, 0.0])
 
-    def initialize_states(
-        self, infected_frac: float = 0.05, skeptic_frac: float = 0.05, seed: Optional[int] = None
-    ) -> None:
+    def _susceptible_targets(self, source_code: int) -> np.ndarray:
         """
-        Initialize agent states.
+        Gather the susceptible endpoints of edges leaving agents in one state.
 
         Args:
-            infected_frac: Fraction of initially infected agents
-            skeptic_frac: Fraction of initially skeptic agents
-            seed: Random seed for reproducibility
-        """
-        if seed is not None:
-            random.seed(seed)
+            source_code: State code of the spreading agents (I or Z)
 
-        nodes = list(self.graph.nodes())
-        random.shuffle(nodes)
-        n = len(nodes)
+        Returns:
+            Array of target node indices, one entry per edge
+        """
+        state = self._state_arr
+        targets = self._neighbors_of(np.flatnonzero((state == source_code) & self._connected))
+        return targets[state[targets] == S_CODE]
+
+    @staticmethod
+    def _contact_proposals(
+        targets: np.ndarray,
+        u: np.ndarray,
+        source_code: int,
+        prob_contact: float,
+        prob_joint: float,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Resolve the contact-based proposals issued along a set of edges.
 
-        # Reset all to susceptible
-        for node in nodes:
-            self.states[node] = "S"
+        A single uniform per edge samples the compound event: below
+        ``prob_joint`` the neighbor is proposed to adopt ``source_code``,
+        below ``prob_contact`` it is proposed to become E, otherwise nothing
+        happens.
 
-        # Set infected
-        n_infected = int(n * infected_frac)
-        for i in range(n_infected):
-            self.states[nodes[i]] = "I"
+        Args:
+            targets: Susceptible edge endpoints
+            u: One uniform draw per edge
+            source_code: State code of the spreading agents (I or Z)
+            prob_contact: Per-step contact probability
+            prob_joint: Probability of contact followed by S -> source state
 
-        # Set skeptics
-        n_skeptic = int(n * skeptic_frac)
-        for i in range(n_infected, n_infected + n_skeptic):
-            self.states[nodes[i]] = "Z"
+        Returns:
+            Tuple (targets, proposed state codes)
+        """
+        contact = u < prob_contact
+        converted = u[contact] < prob_joint
+        proposed = np.where(converted, source_code, E_CODE).astype(np.int8)
+        return targets[contact], proposed
 
     def step(self) -> None:
         """Execute one simulation step using synchronous update."""
-        proposals = defaultdict(list)
+        if self.use_jit:
+            seiz_step(
+                self._indptr,
+                self._indices,
+                self._state_arr,
+                self._proposed,
+                self._proposal_counts,
+                self.prob_contact_I,
+                self.prob_contact_Z,
+                self.prob_E_to_I,
+                self.prob_I_to_E,
+                self._p_to_I,
+                self._p_to_Z,
+                self._rng,
+            )
+            return
+
+        state = self._state_arr
+        i_targets = self._susceptible_targets(I_CODE)
+        z_targets = self._susceptible_targets(Z_CODE)
+        internal_prob = self._internal_prob[state]
+        internal = np.flatnonzero(internal_prob > 0)
+
+        # Draw every uniform needed by this step in a single call
+        n_i, n_z = i_targets.size, z_targets.size
+        u = self._rng.random(n_i + n_z + internal.size)
+        u_i, u_z, u_internal = u[:n_i], u[n_i : n_i + n_z], u[n_i + n_z :]
 
         # --- Contact-based transitions ---
-        for node, state in self.states.items():
-            # Infectious contacts (S-I)
-            if state == "I":
-                for neighbor in self.graph.neighbors(node):
-                    if self.states[neighbor] == "S" and random.random() < self.prob_contact_I:
-                        if random.random() < self.p:
-                            proposals[neighbor].append("I")
-                        else:
-                            proposals[neighbor].append("E")
-
-            # Skeptic contacts (S-Z)
-            elif state == "Z":
-                for neighbor in self.graph.neighbors(node):
-                    if self.states[neighbor] == "S" and random.random() < self.prob_contact_Z:
-                        if random.random() < self.l:
-                            proposals[neighbor].append("Z")
-                        else:
-                            proposals[neighbor].append("E")
-
-        # --- Internal progressions (E <-> I) ---
-        for node, state in self.states.items():
-            if state == "E" and random.random() < self.prob_E_to_I:
-                proposals[node].append("I")
-            elif state == "I" and random.random() < self.prob_I_to_E:
-                proposals[node].append("E")
+        # Infectious contacts (S-I)
+        i_targets, i_proposed = self._contact_proposals(
+            i_targets, u_i, I_CODE, self.prob_contact_I, self._p_to_I
+        )
+        # Skeptic contacts (S-Z)
+        z_targets, z_proposed = self._contact_proposals(
+            z_targets, u_z, Z_CODE, self.prob_contact_Z, self._p_to_Z
+        )
+
+        # --- Internal progressions (E <-> I), both in a single pass ---
+        internal = internal[u_internal < internal_prob[internal]]
+
+        targets = np.concatenate([i_targets, z_targets, internal])
+        proposed = np.concatenate([i_proposed, z_proposed, self._internal_target[state[internal]]])
+        if targets.size == 0:
+            return
 
         # --- Apply updates synchronously ---
-        for node, plist in proposals.items():
-            # If multiple proposals, choose one randomly
-            chosen = random.choice(plist)
-            self.states[node] = chosen
-
-    def get_states(self) -> Dict[Any, str]:
-        """
-        Get current states of all agents.
-
-        Returns:
-            Dictionary mapping node -> state
-        """
-        return dict(self.states)
+        # Most nodes receive at most one proposal, which is taken as is
+        counts = self._proposal_counts
+        counts[:] = 0
+        np.add.at(counts, targets, 1)
+        single = counts[targets] == 1
+        winner = self._proposed
+        winner[:] = -1
+        winner[targets[single]] = proposed[single]
+
+        # If multiple proposals, choose one randomly: shuffle them and keep
+        # the first proposal received by each node.
+        conflicted = np.flatnonzero(~single)
+        if conflicted.size:
+            order = conflicted[self._rng.permutation(conflicted.size)]
+            nodes, first = np.unique(targets[order], return_index=True)
+            winner[nodes] = proposed[order[first]]
+
+        updated = winner >= 0
+        state[updated] = winner[updated]
@@ -5,22 +5,40 @@ This module implements the SEIZ model with a basic moderation mechanism
 that can intervene on infected agents.
 """
 
-import random
-from typing import Any, Dict, Optional
+from typing import Optional, Tuple, Union
 
 import networkx as nx
+import numpy as np
 
-from .base import BaseEpidemicModel
+from ._kernels import NUMBA_AVAILABLE, replicate_generators, seiz_bm_ensemble, seiz_bm_step
+from .base import E_CODE, I_CODE, S_CODE, STATE_LABELS, ArrayEpidemicModel, derived_param
 
 
 class Agent:
-    """Simple agent with state information."""
+    """
+    View of one agent stored in the model's state array.
+
+    Agents are attached to the graph nodes for convenience; their state is
+    read from and written to the owning model.
+    """
+
+    __slots__ = ("_model", "idx")
 
-    def __init__(self, state: str = "S"):
-        self.state = state
+    def __init__(self, model: "SEIZBMModel", idx: int):
+        self._model = model
+        self.idx = idx
 
+    @property
+    def state(self) -> str:
+        """Current state label (S, E, I or Z)."""
+        return STATE_LABELS[self._model._state_arr[self.idx]]
 
-class SEIZBMModel(BaseEpidemicModel):
+    @state.setter
+    def state(self, value: str) -> None:
+        self._model._state_arr[self.idx] = STATE_LABELS.index(value)
+
+
+class SEIZBMModel(ArrayEpidemicModel):
     """
     SEIZ model with Basic Moderator.
 
@@ -42,11 +60,22 @@ class SEIZBMModel(BaseEpidemicModel):
         l: Probability S -> Z after contact with Z
         mu: Moderator intervention rate (probability I is moderated)
         m: Probability moderated I returns to S
+
+    When Numba is installed, steps run through a compiled kernel; set
+    ``use_jit = False`` on an instance to force the NumPy implementation.
     """
 
+    # Parameters of the per-step lookup tables, refreshed when one is set
+    beta = derived_param("beta")
+    b = derived_param("b")
+    p = derived_param("p")
+    l = derived_param("l")
+    mu = derived_param("mu")
+    m = derived_param("m")
+
     def __init__(
         self,
-        graph: nx.Graph,
+        graph: Union[nx.Graph, Tuple[np.ndarray, np.ndarray]],
         beta: float,
         b: float,
         rho: float,
@@ -60,7 +89,8 @@ class SEIZBMModel(BaseEpidemicModel):
         Initialize the SEIZ-BM model.
 
         Args:
-            graph: Social network (NetworkX graph)
+            graph: Social network (NetworkX graph), or its CSR adjacency
+                (indptr, indices) with nodes 0..N-1
             beta: S-I contact rate
             b: S-Z contact rate
             rho: E-I contact rate
@@ -91,97 +121,152 @@ class SEIZBMModel(BaseEpidemicModel):
         self.mu = mu
         self.m = m
 
-        # Initialize agents
-        for node in self.graph.nodes():
-            self.graph.nodes[node]["agent"] = Agent("S")
+        self._update_derived()
 
-    def initialize_states(
-        self, infected_frac: float = 0.05, skeptic_frac: float = 0.05, seed: Optional[int] = None
-    ) -> None:
+        # Uniforms consumed by the last NumPy step (agents first, then the edges
+        # of S agents and of E agents, in CSR order), kept for inspection and replay
+        self._last_randoms = np.empty(0)
+
+        # Compiled kernel (optional) and its shadow state array
+        self.use_jit = NUMBA_AVAILABLE
+        self._next_states = np.empty(self._N, dtype=np.int8)
+
+        # Initialize agents, also kept in node index order for direct access
+        self._agents = [Agent(self, i) for i in range(self._N)]
+        if self._graph is not None:
+            self._decorate_graph(self._graph)
+
+    def _update_derived(self) -> None:
+        """Recompute the per-step lookup tables from the model parameters."""
+        # Per-neighbor-state lookup tables for S contacts: contact
+        # probability, and probability of adopting the neighbor's state
+        self._contact_prob = np.array([0.0, 0.0, self.beta, self.b])
+        self._adopt_prob = np.array([0.0, 0.0, self.p, self.l])
+
+        # Moderation succeeds with probability mu * m per step
+        self._p_moderate = self.mu * self.m
+
+    def _decorate_graph(self, graph: nx.Graph) -> None:
         """
-        Initialize agent states.
+        Attach the agents to the graph nodes (node attribute "agent").
 
         Args:
+            graph: NetworkX graph of the model
+        """
+        for node, agent in zip(self._nodes, self._agents):
+            graph.nodes[node]["agent"] = agent
+
+    @classmethod
+    def run_ensemble(
+        cls,
+        graph: Union[nx.Graph, Tuple[np.ndarray, np.ndarray]],
+        n_seeds: int,
+        steps: int = 100,
+        infected_frac: float = 0.05,
+        skeptic_frac: float = 0.05,
+        seed: Optional[int] = None,
+        **params,
+    ) -> np.ndarray:
+        """
+        Run independent replicates of the model, one per random seed.
+
+        With Numba installed, the replicates run in parallel threads, each with
+        its own state arrays; otherwise they run one after the other.
+
+        Args:
+            graph: Social network (NetworkX graph), or its CSR adjacency
+                (indptr, indices) with nodes 0..N-1
+            n_seeds: Number of replicates
+            steps: Number of simulation steps
             infected_frac: Fraction of initially infected agents
             skeptic_frac: Fraction of initially skeptic agents
-            seed: Random seed for reproducibility
+            seed: Random seed used to derive the replicate seeds
+            **params: Model parameters (beta, b, rho, p, epsilon, l, mu, m)
+
+        Returns:
+            int32 array of shape (n_seeds, steps + 1, 4) with the S, E, I, Z
+            counts of every replicate and step
         """
-        if seed is not None:
-            random.seed(seed)
+        model = cls(graph, **params)
+        seeds = np.random.default_rng(seed).integers(0, 2**31 - 1, size=n_seeds)
+
+        if NUMBA_AVAILABLE:
+            return seiz_bm_ensemble(
+                model._indptr,
+                model._indices,
+                replicate_generators(seeds.tolist()),
+                int(model._N * infected_frac),
+                int(model._N * skeptic_frac),
+                steps,
+                model._contact_prob,
+                model._adopt_prob,
+                model.rho,
+                model.epsilon,
+                model._p_moderate,
+            )
 
-        nodes = list(self.graph.nodes())
-        random.shuffle(nodes)
-        n = len(nodes)
+        history = np.empty((n_seeds, steps + 1, len(STATE_LABELS)), dtype=np.int32)
+        for r, replicate_seed in enumerate(seeds.tolist()):
+            model.initialize_states(infected_frac, skeptic_frac, seed=replicate_seed)
+            model._simulate(steps)
+            records = model.history_array()
+            for j, label in enumerate(STATE_LABELS):
+                history[r, :, j] = records[label]
+        return history
 
-        # Reset all to susceptible
-        for node in nodes:
-            self.graph.nodes[node]["agent"].state = "S"
+    def step(self) -> None:
+        """Execute one simulation step using synchronous update."""
+        if self.use_jit:
+            seiz_bm_step(
+                self._indptr,
+                self._indices,
+                self._state_arr,
+                self._next_states,
+                self._contact_prob,
+                self._adopt_prob,
+                self.rho,
+                self.epsilon,
+                self._p_moderate,
+                self._rng,
+            )
+            self._state_arr, self._next_states = self._next_states, self._state_arr
+            return
 
-        # Set infected
-        n_infected = int(n * infected_frac)
-        for i in range(n_infected):
-            self.graph.nodes[nodes[i]]["agent"].state = "I"
+        state = self._state_arr
+        connected = self._connected
+        # Isolated S agents cannot make contact, so they are skipped entirely
+        s_nodes = np.flatnonzero((state == S_CODE) & connected)
+        e_nodes = np.flatnonzero(state == E_CODE)
+        i_nodes = np.flatnonzero(state == I_CODE)
+        s_owners, s_neighbors = self._edges_from(s_nodes)
+        e_owners, e_neighbors = self._edges_from(e_nodes[connected[e_nodes]])
 
-        # Set skeptics
-        n_skeptic = int(n * skeptic_frac)
-        for i in range(n_infected, n_infected + n_skeptic):
-            self.graph.nodes[nodes[i]]["agent"].state = "Z"
+        # One uniform per agent and one per inspected edge, in a single draw
+        n, n_s, n_e = self._N, s_owners.size, e_owners.size
+        u = self._rng.random(n + n_s + n_e)
+        self._last_randoms = u
+        u_node, u_s, u_e = u[:n], u[n : n + n_s], u[n + n_s :]
 
-    def step(self) -> None:
-        """Execute one simulation step."""
-        new_states = {}
-
-        for node in self.graph.nodes():
-            agent = self.graph.nodes[node]["agent"]
-            state = agent.state
-
-            if state == "S":
-                # Check for contacts with infected or skeptic neighbors
-                neighbors = list(self.graph.neighbors(node))
-                for neighbor in neighbors:
-                    nb_state = self.graph.nodes[neighbor]["agent"].state
-
-                    if nb_state == "I" and random.random() < self.beta:
-                        new_states[node] = "I" if random.random() < self.p else "E"
-                        break
-                    elif nb_state == "Z" and random.random() < self.b:
-                        new_states[node] = "Z" if random.random() < self.l else "E"
-                        break
-
-            elif state == "E":
-                # Transition to infected based on epsilon rate
-                if random.random() < self.epsilon:
-                    new_states[node] = "I"
-                else:
-                    # Or through contact with infected neighbors
-                    neighbors = list(self.graph.neighbors(node))
-                    for neighbor in neighbors:
-                        if (
-                            self.graph.nodes[neighbor]["agent"].state == "I"
-                            and random.random() < self.rho
-                        ):
-                            new_states[node] = "I"
-                            break
-
-            elif state == "I":
-                # Moderator intervention
-                if random.random() < self.mu:
-                    if random.random() < self.m:
-                        new_states[node] = "S"
-                    # else stays I (failed moderation)
-
-        # Apply state changes
-        for node, new_state in new_states.items():
-            self.graph.nodes[node]["agent"].state = new_state
-
-    def get_states(self) -> Dict[Any, str]:
-        """
-        Get current states of all agents.
+        # --- S: the first neighbor (in adjacency order) whose contact
+        # succeeds decides the outcome ---
+        nb_state = state[s_neighbors]
+        fired = np.flatnonzero(u_s < self._contact_prob[nb_state])
+        owners = s_owners[fired]
+        first = np.ones(owners.size, dtype=bool)
+        first[1:] = owners[1:] != owners[:-1]
+        s_hit = owners[first]
+        source = nb_state[fired[first]]
+        s_new = np.where(u_node[s_hit] < self._adopt_prob[source], source, E_CODE)
 
-        Returns:
-            Dictionary mapping node -> state
-        """
-        states = {}
-        for node in self.graph.nodes():
-            states[node] = self.graph.nodes[node]["agent"].state
-        return states
+        # --- E: incubation, or contact with any infected neighbor ---
+        e_incubated = e_nodes[u_node[e_nodes] < self.epsilon]
+        e_contacted = e_owners[(state[e_neighbors] == I_CODE) & (u_e < self.rho)]
+
+        # --- I: moderator intervention (I -> S on success) ---
+        i_hit = i_nodes[u_node[i_nodes] < self._p_moderate]
+
+        # --- Apply updates synchronously ---
+        state[s_hit] = s_new
+        state[e_incubated] = I_CODE
+        state[e_contacted] = I_CODE
+        state[i_hit] = S_CODE
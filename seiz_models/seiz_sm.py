@@ -5,27 +5,68 @@ This module implements the SEIZ model with a smart moderation mechanism
 that uses agent profiles (Dark Triad traits) and message toxicity tracking.
 """
 
-import random
-from collections import defaultdict
-from typing import Any, Dict, Optional
+from typing import Optional, Tuple, Union
 
 import networkx as nx
+import numpy as np
 
-from .base import BaseEpidemicModel
+from ._kernels import NUMBA_AVAILABLE, replicate_generators, seiz_sm_ensemble, seiz_sm_step
+from .base import E_CODE, I_CODE, S_CODE, STATE_LABELS, Z_CODE, ArrayEpidemicModel, derived_param
 
 
 class Agent:
-    """Agent with Dark Triad profile and message tracking."""
+    """
+    Agent with Dark Triad profile and message tracking.
+
+    The state, the profile and the message counters are stored in the owning
+    model's arrays; the agent is a view on its row.
+    """
+
+    __slots__ = ("_model", "idx")
+
+    def __init__(self, model: "SEIZSMModel", idx: int):
+        self._model = model
+        self.idx = idx
+
+    @property
+    def state(self) -> str:
+        """Current state label (S, E, I or Z)."""
+        return STATE_LABELS[self._model._state_arr[self.idx]]
+
+    @state.setter
+    def state(self, value: str) -> None:
+        self._model._set_codes(self.idx, STATE_LABELS.index(value))
+
+    @property
+    def profile(self) -> list:
+        """Dark Triad profile: [Narcissism, Machiavellianism, Psychopathy]."""
+        return self._model._profiles[self.idx].tolist()
 
-    def __init__(self, state: str = "S"):
-        self.state = state
-        # Dark Triad profile: [Narcissism, Machiavellianism, Psychopathy]
-        self.profile = [random.random(), random.random(), random.random()]
-        self.toxic_messages = 0  # Count of toxic messages sent
-        self.activity_level = 0  # Number of messages sent overall
+    @property
+    def toxicity(self) -> float:
+        """Toxicity score (mean of the profile), cached by the model."""
+        return float(self._model._toxicity[self.idx])
 
+    @property
+    def toxic_messages(self) -> int:
+        """Count of toxic messages sent since the last moderation."""
+        return int(self._model._toxic_messages[self.idx])
 
-class SEIZSMModel(BaseEpidemicModel):
+    @toxic_messages.setter
+    def toxic_messages(self, value: int) -> None:
+        self._model._toxic_messages[self.idx] = value
+
+    @property
+    def activity_level(self) -> int:
+        """Number of messages sent overall."""
+        return int(self._model._activity[self.idx])
+
+    @activity_level.setter
+    def activity_level(self, value: int) -> None:
+        self._model._activity[self.idx] = value
+
+
+class SEIZSMModel(ArrayEpidemicModel):
     """
     SEIZ model with Smart Moderator.
 
@@ -52,11 +93,18 @@ class SEIZSMModel(BaseEpidemicModel):
         T: Probability threshold to classify a message as toxic
         eta: Probability of I -> E after moderation
         lambd: Probability of E -> Z transition
+
+    When Numba is installed, steps run through a compiled kernel; set
+    ``use_jit = False`` on an instance to force the NumPy implementation.
     """
 
+    # Parameters of the per-agent caches, refreshed when one is set
+    T = derived_param("T")
+    eta = derived_param("eta")
+
     def __init__(
         self,
-        graph: nx.Graph,
+        graph: Union[nx.Graph, Tuple[np.ndarray, np.ndarray]],
         beta: float,
         b: float,
         rho: float,
@@ -73,7 +121,8 @@ class SEIZSMModel(BaseEpidemicModel):
         Initialize the SEIZ-SM model.
 
         Args:
-            graph: Social network (NetworkX graph)
+            graph: Social network (NetworkX graph), or its CSR adjacency
+                (indptr, indices) with nodes 0..N-1
             beta: S-I contact rate
             b: S-Z contact rate
             rho: E-I contact rate
@@ -113,9 +162,77 @@ class SEIZSMModel(BaseEpidemicModel):
         self.eta = eta
         self.lambd = lambd
 
-        # Initialize agents with profiles
-        for node in self.graph.nodes():
-            self.graph.nodes[node]["agent"] = Agent("S")
+        # Profiles are drawn from the model generator, into buffers reused by
+        # every later initialization
+        self._profiles = np.empty((self._N, 3), dtype=np.float32)
+        self._toxicity = np.empty(self._N)
+        self._toxic_profile = np.empty(self._N, dtype=bool)
+        self._p_expose = np.empty(self._N)
+        self._draw_profiles()
+
+        # Running S and E counts, updated on every transition; once both are
+        # zero no message can change a state any more
+        self._count_open_states()
+
+        # Message counters: toxic messages since the last moderation, and
+        # messages sent overall
+        self._toxic_messages = np.zeros(self._N, dtype=np.int32)
+        self._activity = np.zeros(self._N, dtype=np.int32)
+
+        # Compiled step kernel (optional) and its pool of sender candidates
+        self.use_jit = NUMBA_AVAILABLE
+        self._sender_pool = np.arange(self._N, dtype=np.int64)
+
+        # Initialize agents, also kept in node index order for direct access
+        self._agents = [Agent(self, i) for i in range(self._N)]
+        if self._graph is not None:
+            self._decorate_graph(self._graph)
+
+    def _count_open_states(self) -> None:
+        """Recount the agents in the S and E states from the state array."""
+        counts = self._count_codes()
+        self._n_s = int(counts[S_CODE])
+        self._n_e = int(counts[E_CODE])
+
+    def _set_codes(self, idx, code: int) -> None:
+        """
+        Set the state code of agents, keeping the S and E counts current.
+
+        Args:
+            idx: Node index, or array of distinct node indices
+            code: New state code
+        """
+        old = self._state_arr[idx]
+        n = np.size(old)
+        self._n_s += (code == S_CODE) * n - int(np.count_nonzero(old == S_CODE))
+        self._n_e += (code == E_CODE) * n - int(np.count_nonzero(old == E_CODE))
+        self._state_arr[idx] = code
+
+    def _draw_profiles(self) -> None:
+        """Draw the Dark Triad profiles of all agents and their toxicity scores."""
+        # One row per agent: [Narcissism, Machiavellianism, Psychopathy]
+        self._rng.random(dtype=np.float32, out=self._profiles)
+        # Profiles never change, so the toxicity (profile mean) is computed once
+        self._profiles.mean(axis=1, dtype=np.float64, out=self._toxicity)
+        self._update_derived()
+
+    def _update_derived(self) -> None:
+        """Recompute the per-agent caches derived from the toxicity scores."""
+        # Whether an agent's messages are toxic, checked for every message sent
+        np.greater_equal(self._toxicity, self.T, out=self._toxic_profile)
+        # Probability I -> E once moderated: eta scaled by the dark trait factor
+        np.subtract(1.0, self._toxicity, out=self._p_expose)
+        self._p_expose *= self.eta
+
+    def _decorate_graph(self, graph: nx.Graph) -> None:
+        """
+        Attach the agents to the graph nodes (node attribute "agent").
+
+        Args:
+            graph: NetworkX graph of the model
+        """
+        for node, agent in zip(self._nodes, self._agents):
+            graph.nodes[node]["agent"] = agent
 
     def initialize_states(
         self, infected_frac: float = 0.05, skeptic_frac: float = 0.05, seed: Optional[int] = None
@@ -128,42 +245,117 @@ class SEIZSMModel(BaseEpidemicModel):
             skeptic_frac: Fraction of initially skeptic agents
             seed: Random seed for reproducibility
         """
-        if seed is not None:
-            random.seed(seed)
+        super().initialize_states(infected_frac, skeptic_frac, seed)
+        self._count_open_states()
+
+        # Regenerate profiles and reset the message counters
+        self._draw_profiles()
+        self._toxic_messages[:] = 0
+        self._activity[:] = 0
+
+    @classmethod
+    def run_ensemble(
+        cls,
+        graph: Union[nx.Graph, Tuple[np.ndarray, np.ndarray]],
+        n_seeds: int,
+        steps: int = 100,
+        infected_frac: float = 0.05,
+        skeptic_frac: float = 0.05,
+        seed: Optional[int] = None,
+        **params,
+    ) -> np.ndarray:
+        """
+        Run independent replicates of the model, one per random seed.
+
+        With Numba installed, the replicates run in parallel threads, each with
+        its own profiles, state and counter arrays; otherwise they run one
+        after the other.
+
+        Args:
+            graph: Social network (NetworkX graph), or its CSR adjacency
+                (indptr, indices) with nodes 0..N-1
+            n_seeds: Number of replicates
+            steps: Number of simulation steps
+            infected_frac: Fraction of initially infected agents
+            skeptic_frac: Fraction of initially skeptic agents
+            seed: Random seed used to derive the replicate seeds
+            **params: Model parameters (beta, b, rho, p, epsilon, l, n, theta, T,
+                eta, lambd)
+
+        Returns:
+            int32 array of shape (n_seeds, steps + 1, 4) with the S, E, I, Z
+            counts of every replicate and step
+        """
+        model = cls(graph, **params)
+        seeds = np.random.default_rng(seed).integers(0, 2**31 - 1, size=n_seeds)
+
+        if NUMBA_AVAILABLE:
+            return seiz_sm_ensemble(
+                model._indptr,
+                model._indices,
+                replicate_generators(seeds.tolist()),
+                int(model._N * infected_frac),
+                int(model._N * skeptic_frac),
+                steps,
+                min(model.n, model._N),
+                model.theta,
+                model.T,
+                model.beta,
+                model.p,
+                model.rho,
+                model.epsilon,
+                model.eta,
+                model.lambd,
+            )
+
+        history = np.empty((n_seeds, steps + 1, len(STATE_LABELS)), dtype=np.int32)
+        for r, replicate_seed in enumerate(seeds.tolist()):
+            model.initialize_states(infected_frac, skeptic_frac, seed=replicate_seed)
+            model._simulate(steps)
+            records = model.history_array()
+            for j, label in enumerate(STATE_LABELS):
+                history[r, :, j] = records[label]
+        return history
+
+    def activity_sum(self) -> int:
+        """
+        Total number of messages sent by all agents.
 
-        nodes = list(self.graph.nodes())
-        random.shuffle(nodes)
-        n = len(nodes)
+        Returns:
+            Sum of the agents' activity levels
+        """
+        return int(self._activity.sum())
 
-        # Reset all to susceptible and regenerate profiles
-        for node in nodes:
-            agent = self.graph.nodes[node]["agent"]
-            agent.state = "S"
-            agent.profile = [random.random(), random.random(), random.random()]
-            agent.toxic_messages = 0
-            agent.activity_level = 0
+    def toxic_sum(self, state: Optional[str] = None) -> int:
+        """
+        Total of the agents' toxic message counters (reset on moderation).
 
-        # Set infected
-        n_infected = int(n * infected_frac)
-        for i in range(n_infected):
-            self.graph.nodes[nodes[i]]["agent"].state = "I"
+        Args:
+            state: Only count agents currently in this state (S, E, I or Z);
+                   all agents if None
 
-        # Set skeptics
-        n_skeptic = int(n * skeptic_frac)
-        for i in range(n_infected, n_infected + n_skeptic):
-            self.graph.nodes[nodes[i]]["agent"].state = "Z"
+        Returns:
+            Sum of the agents' toxic message counters
+        """
+        if state is None:
+            return int(self._toxic_messages.sum())
+        mask = self._state_arr == STATE_LABELS.index(state)
+        return int(self._toxic_messages[mask].sum())
 
     def compute_toxicity(self, agent: Agent) -> float:
         """
         Compute toxicity score based on Dark Triad profile.
 
+        Profiles only change when they are redrawn by ``initialize_states``,
+        so the score is read from the model's cache.
+
         Args:
             agent: Agent to compute toxicity for
 
         Returns:
             Toxicity score (average of Dark Triad traits)
         """
-        return sum(agent.profile) / 3.0
+        return agent.toxicity
 
     def moderator_intervention(self, agent: Agent) -> None:
         """
@@ -172,17 +364,31 @@ class SEIZSMModel(BaseEpidemicModel):
         Args:
             agent: Agent to potentially moderate
         """
-        if agent.toxic_messages >= self.theta:
-            # Probability of becoming exposed depends on Dark Triad traits
-            dark_trait_factor = 1 - sum(agent.profile) / 3.0
-            effective_eta = self.eta * dark_trait_factor
+        self._moderate_batch(np.array([agent.idx]))
+
+    def _moderate_batch(self, candidates: np.ndarray) -> None:
+        """
+        Apply the moderator to a set of distinct agents in one pass.
 
-            if random.random() < effective_eta:
-                agent.state = "E"
-                agent.toxic_messages = 0  # Reset counter
-            elif random.random() < self.lambd:
-                agent.state = "Z"
-                agent.toxic_messages = 0
+        Agents whose toxic message count reached ``theta`` become exposed
+        (probability depending on their Dark Triad traits) or, failing that,
+        skeptic; either outcome resets their counter.
+
+        Args:
+            candidates: Distinct node indices of the agents to moderate
+        """
+        # Both Bernoulli tests of every candidate, drawn in a single call
+        u_expose, u_skeptic = self._rng.random((2, candidates.size))
+        expose = u_expose < self._p_expose[candidates]
+        skeptic = u_skeptic < self.lambd
+
+        flagged = self._toxic_messages[candidates] >= self.theta
+        to_exposed = candidates[flagged & expose]
+        to_skeptic = candidates[flagged & ~expose & skeptic]
+        self._set_codes(to_exposed, E_CODE)
+        self._set_codes(to_skeptic, Z_CODE)
+        self._toxic_messages[to_exposed] = 0
+        self._toxic_messages[to_skeptic] = 0
 
     def send_messages(self) -> list:
         """
@@ -191,22 +397,29 @@ class SEIZSMModel(BaseEpidemicModel):
         Returns:
             List of nodes that sent toxic messages
         """
-        nodes = list(self.graph.nodes())
-        senders = random.sample(nodes, min(self.n, len(nodes)))
-        toxic_senders = []
+        return [self._nodes[i] for i in self._send_messages().tolist()]
+
+    def _send_messages(self) -> np.ndarray:
+        """
+        Simulate message sending process with toxicity, by node index.
+
+        Returns:
+            Indices of the agents that sent toxic messages
+        """
+        # Senders are distinct, so the counters can be updated by fancy indexing
+        senders = self._rng.choice(self._N, size=min(self.n, self._N), replace=False)
+        self._activity[senders] += 1
 
-        for sender in senders:
-            agent = self.graph.nodes[sender]["agent"]
-            agent.activity_level += 1
+        # Only infected senders with a toxic enough profile send toxic messages
+        toxic = (self._state_arr[senders] == I_CODE) & self._toxic_profile[senders]
+        candidates = senders[toxic]
 
-            if agent.state == "I":
-                toxicity = self.compute_toxicity(agent)
-                if toxicity >= self.T:
-                    agent.toxic_messages += 1
-                    toxic_senders.append(sender)
-                    self.moderator_intervention(agent)
+        # Candidates are distinct, so the moderator decisions are independent
+        # and can be applied together
+        self._toxic_messages[candidates] += 1
+        self._moderate_batch(candidates)
 
-        return toxic_senders
+        return candidates
 
     def spread_toxicity(self, toxic_senders: list) -> None:
         """
@@ -215,43 +428,120 @@ class SEIZSMModel(BaseEpidemicModel):
         Args:
             toxic_senders: List of nodes that sent toxic messages
         """
-        for sender in toxic_senders:
-            for neighbor in self.graph.neighbors(sender):
-                nb_agent = self.graph.nodes[neighbor]["agent"]
+        senders = [self._node_idx[sender] for sender in toxic_senders]
+        self._spread_toxicity(np.array(senders, dtype=np.int64))
 
-                if nb_agent.state == "S":
-                    if random.random() < self.beta:
-                        nb_agent.state = "I" if random.random() < self.p else "E"
+    def _spread_toxicity(self, toxic_senders: np.ndarray) -> None:
+        """
+        Neighbors of toxic senders may transition based on SEIZ logic, by node index.
+
+        Messages are delivered in sender order, so a neighbor reached several
+        times can be exposed by one message and infected by a later one.
 
-                elif nb_agent.state == "E":
-                    if random.random() < self.rho:
-                        nb_agent.state = "I"
+        Args:
+            toxic_senders: Indices of the agents that sent toxic messages
+        """
+        # Nothing left to expose or infect (absorbing configuration)
+        if self._n_s == 0 and self._n_e == 0:
+            return
+
+        targets = self._neighbors_of(toxic_senders[self._connected[toxic_senders]])
+        if targets.size == 0:
+            return
+
+        # Work on the distinct neighbors; `visit` maps deliveries to them
+        reached, visit = np.unique(targets, return_inverse=True)
+        codes = self._state_arr[reached]
+        state = codes[visit]
+        new_codes = codes.copy()
+
+        # Two uniforms per delivery (contact, outcome), in a single call
+        n_visits = targets.size
+        u_contact, u_outcome = self._rng.random((2, n_visits))
+
+        # --- S: the first successful contact infects or exposes the neighbor ---
+        contacts = np.flatnonzero((state == S_CODE) & (u_contact < self.beta))
+        hit, first = np.unique(visit[contacts], return_index=True)
+        first = contacts[first]
+        new_codes[hit] = np.where(u_outcome[first] < self.p, I_CODE, E_CODE)
+
+        # --- E: exposed neighbors (already, or since their first contact)
+        # are infected by any later successful contact ---
+        exposed_since = np.full(reached.size, n_visits)
+        exposed_since[codes == E_CODE] = -1
+        exposed = new_codes[hit] == E_CODE
+        exposed_since[hit[exposed]] = first[exposed]
+        later = np.arange(n_visits) > exposed_since[visit]
+        new_codes[visit[later & (u_contact < self.rho)]] = I_CODE
+
+        self._n_s += int(np.count_nonzero(new_codes == S_CODE) - np.count_nonzero(codes == S_CODE))
+        self._n_e += int(np.count_nonzero(new_codes == E_CODE) - np.count_nonzero(codes == E_CODE))
+        self._state_arr[reached] = new_codes
 
     def internal_transitions(self) -> None:
         """Handle E -> I and E -> Z transitions."""
-        for node in self.graph.nodes():
-            agent = self.graph.nodes[node]["agent"]
+        if self._n_e == 0:
+            return
 
-            if agent.state == "E":
-                if random.random() < self.epsilon:
-                    agent.state = "I"
-                elif random.random() < self.lambd:
-                    agent.state = "Z"
+        state = self._state_arr
+        exposed = np.flatnonzero(state == E_CODE)
+
+        # Incubation first, then the skeptic test for the agents still
+        # exposed; both uniforms of every agent are drawn in a single call
+        u_incubate, u_skeptic = self._rng.random((2, exposed.size))
+        incubate = u_incubate < self.epsilon
+        skeptic = ~incubate & (u_skeptic < self.lambd)
+
+        state[exposed[incubate]] = I_CODE
+        state[exposed[skeptic]] = Z_CODE
+        self._n_e = exposed.size - int(incubate.sum()) - int(skeptic.sum())
 
     def step(self) -> None:
         """Execute one simulation step."""
-        toxic_senders = self.send_messages()
-        self.spread_toxicity(toxic_senders)
+        if self.use_jit:
+            self._n_s, self._n_e = seiz_sm_step(
+                self._indptr,
+                self._indices,
+                self._state_arr,
+                self._toxic_profile,
+                self._p_expose,
+                self._toxic_messages,
+                self._activity,
+                self._sender_pool,
+                self._n_s,
+                self._n_e,
+                min(self.n, self._N),
+                self.theta,
+                self.beta,
+                self.p,
+                self.rho,
+                self.epsilon,
+                self.lambd,
+                self._rng,
+            )
+            return
+
+        self._spread_toxicity(self._send_messages())
         self.internal_transitions()
 
-    def get_states(self) -> Dict[Any, str]:
+    def _checkpoint(self) -> tuple:
         """
-        Get current states of all agents.
+        Capture the mutable simulation state.
 
         Returns:
-            Dictionary mapping node -> state
+            Tuple (state, toxic message and activity array copies)
+        """
+        return self._state_arr.copy(), self._toxic_messages.copy(), self._activity.copy()
+
+    def _restore_checkpoint(self, checkpoint: tuple) -> None:
+        """
+        Restore a snapshot taken by ``_checkpoint``.
+
+        Args:
+            checkpoint: Snapshot returned by ``_checkpoint``
         """
-        states = {}
-        for node in self.graph.nodes():
-            states[node] = self.graph.nodes[node]["agent"].state
-        return states
+        states, toxic_messages, activity = checkpoint
+        self._state_arr[:] = states
+        self._toxic_messages[:] = toxic_messages
+        self._activity[:] = activity
+        self._count_open_states()
@@ -50,6 +50,13 @@ setup(
         ],
         "animation": [
             "pillow>=9.0.0",
+            "imageio>=2.28.0",
+        ],
+        "jit": [
+            "numba>=0.57",
+        ],
+        "json": [
+            "orjson>=3.6",
         ],
     },
 )
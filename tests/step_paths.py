@@ -0,0 +1,72 @@
+"""
+Shared checks of the NumPy and kernel step paths of the array-backed models.
+"""
+
+from contextlib import ExitStack, contextmanager
+from unittest import mock
+
+import numpy as np
+
+from seiz_models import _kernels, seiz, seiz_bm, seiz_sm
+from seiz_models._kernels import NUMBA_AVAILABLE
+
+# Step paths worth running: the kernel path only differs from the NumPy one
+# when numba compiles it
+STEP_PATHS = (False, True) if NUMBA_AVAILABLE else (False,)
+
+
+@contextmanager
+def fallback_kernels():
+    """Run the kernels as plain Python, as they run when numba is missing."""
+    with ExitStack() as stack:
+        for module in (_kernels, seiz, seiz_bm, seiz_sm):
+            for name, value in list(vars(module).items()):
+                if hasattr(value, "py_func"):
+                    stack.enter_context(mock.patch.object(module, name, value.py_func))
+        yield
+
+
+def assert_step_paths_agree(test, model, steps, runs=400):
+    """Assert that the NumPy and compiled steps of a model simulate the same process.
+
+    Both paths run from the same seeded initial states; the mean count of every
+    state at every step must agree within four standard errors.
+
+    Args:
+        test: Test case used to report the failure
+        model: Array-backed model to simulate
+        steps: Number of steps per run
+        runs: Number of seeded runs per path
+    """
+    counts = {}
+    for use_jit in (False, True):
+        model.use_jit = use_jit
+        records = []
+        for seed in range(runs):
+            model.initialize_states(infected_frac=0.1, skeptic_frac=0.1, seed=seed)
+            model._simulate(steps)
+            history = model.history_array()
+            records.append([history[label] for label in "SEIZ"])
+        counts[use_jit] = np.array(records, dtype=float)
+
+    numpy_runs, jit_runs = counts[False], counts[True]
+    diff = np.abs(numpy_runs.mean(axis=0) - jit_runs.mean(axis=0))
+    stderr = np.sqrt((numpy_runs.var(axis=0) + jit_runs.var(axis=0)) / runs)
+    test.assertTrue(np.all(diff <= 4 * stderr + 1e-9), diff / (stderr + 1e-9))
+
+
+def assert_fallback_step_runs(test, model, steps=5):
+    """Assert that a model steps through its kernel run as plain Python.
+
+    Args:
+        test: Test case used to report the failure
+        model: Array-backed model, with its states already initialized
+        steps: Number of steps to run
+    """
+    model.use_jit = True
+    with fallback_kernels():
+        history = model.run(steps=steps)
+
+    totals = [sum(record[label] for label in "SEIZ") for record in history]
+    test.assertEqual(totals, [len(model.state_array)] * (steps + 1))
+    test.assertNotEqual(history[0], dict(history[-1], step=0))
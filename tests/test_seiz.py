@@ -8,18 +8,26 @@ import tempfile
 import unittest
 
 import networkx as nx
+import numpy as np
 
 from seiz_models import SEIZModel
+from seiz_models._kernels import NUMBA_AVAILABLE
+from seiz_models.base import I_CODE
+
+from .step_paths import STEP_PATHS, assert_fallback_step_runs, assert_step_paths_agree
 
 
 class TestSEIZModel(unittest.TestCase):
     """Test cases for SEIZModel."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Set up fixtures shared by all tests."""
+        # Create a small test network once; SEIZModel only reads it
+        cls.graph = nx.erdos_renyi_graph(50, 0.1, seed=42)
+
     def setUp(self):
         """Set up test fixtures."""
-        # Create a small test network
-        self.graph = nx.erdos_renyi_graph(50, 0.1, seed=42)
-
         # Standard parameters
         self.params = {"beta": 0.3, "b": 0.2, "rho": 0.2, "eps": 0.1, "p": 0.5, "l": 0.4, "dt": 1.0}
 
@@ -74,6 +82,34 @@ class TestSEIZModel(unittest.TestCase):
         # Total should remain constant
         self.assertEqual(sum(initial_counts.values()), sum(after_counts.values()))
 
+    @unittest.skipUnless(NUMBA_AVAILABLE, "needs numba to compile the kernel")
+    def test_numpy_step_matches_kernel(self):
+        """Test that the NumPy and compiled steps simulate the same process."""
+        model = SEIZModel(self.graph, **self.params)
+        assert_step_paths_agree(self, model, steps=10)
+
+    def test_fallback_kernel_step(self):
+        """Test stepping through the kernel run as plain Python, as without numba."""
+        model = SEIZModel(self.graph, **self.params)
+        model.initialize_states(infected_frac=0.1, skeptic_frac=0.1, seed=123)
+        assert_fallback_step_runs(self, model)
+
+    def test_parameter_update(self):
+        """Test that parameters set after construction take effect."""
+        for use_jit in STEP_PATHS:
+            model = SEIZModel(self.graph, **self.params)
+            model.use_jit = use_jit
+            model.initialize_states(infected_frac=0.1, skeptic_frac=0.0, seed=123)
+            infected = np.flatnonzero(model.state_array == I_CODE)
+
+            # Every contact with I happens and converts; nothing else moves
+            model.prob_contact_I = model.p = 1.0
+            model.prob_I_to_E = 0.0
+            model.step()
+
+            reached = np.union1d(infected, model._neighbors_of(infected))
+            np.testing.assert_array_equal(np.flatnonzero(model.state_array == I_CODE), reached)
+
     def test_run(self):
         """Test running simulation for multiple steps."""
         model = SEIZModel(self.graph, **self.params)
@@ -96,6 +132,30 @@ class TestSEIZModel(unittest.TestCase):
             total = h["S"] + h["E"] + h["I"] + h["Z"]
             self.assertEqual(total, 50)
 
+    def test_history_array(self):
+        """Test structured array view of the history."""
+        model = SEIZModel(self.graph, **self.params)
+        model.initialize_states(infected_frac=0.1, skeptic_frac=0.1, seed=123)
+        history = model.run(steps=10)
+
+        arr = model.history_array()
+
+        self.assertEqual(len(arr), 11)
+        self.assertEqual(list(arr["step"]), list(range(11)))
+        self.assertEqual(list(arr["I"]), [h["I"] for h in history])
+
+    def test_preserve_state(self):
+        """Test that steps inside _preserve_state are rolled back."""
+        model = SEIZModel(self.graph, **self.params)
+        model.initialize_states(infected_frac=0.2, skeptic_frac=0.1, seed=123)
+        initial_states = model.get_states()
+
+        with model._preserve_state():
+            for _ in range(10):
+                model.step()
+
+        self.assertEqual(model.get_states(), initial_states)
+
     def test_count_states(self):
         """Test state counting."""
         model = SEIZModel(self.graph, **self.params)
@@ -155,6 +215,52 @@ class TestSEIZModel(unittest.TestCase):
         finally:
             os.unlink(filepath)
 
+    def test_save_json_compact(self):
+        """Test that the streamed JSON files match to_json()."""
+        model = SEIZModel(self.graph, **self.params)
+        model.initialize_states(infected_frac=0.1, skeptic_frac=0.1, seed=123)
+        model.run(steps=5)
+
+        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".json") as f:
+            filepath = f.name
+
+        try:
+            model.save_json(filepath, compact=True)
+            with open(filepath, "r") as f:
+                compact = json.load(f)
+
+            model.save_json(filepath, compact=False)
+            with open(filepath, "r") as f:
+                indented = f.read()
+
+            self.assertEqual(compact, json.loads(model.to_json()))
+            self.assertEqual(indented, model.to_json())
+        finally:
+            os.unlink(filepath)
+
+    def test_json_parameter_types(self):
+        """Test JSON export of NumPy-scalar and small float parameters."""
+        params = dict(self.params, beta=np.float64(0.3), b=np.float32(0.25), rho=1e-5)
+        model = SEIZModel(self.graph, **params)
+        model.initialize_states(infected_frac=0.1, skeptic_frac=0.1, seed=123)
+        model.run(steps=5)
+
+        json_str = model.to_json()
+        data = json.loads(json_str)
+        self.assertEqual(data["parameters"]["beta"], 0.3)
+        self.assertEqual(data["parameters"]["b"], 0.25)
+        self.assertIn('"rho": 1e-05', json_str)
+
+        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".json") as f:
+            filepath = f.name
+
+        try:
+            model.save_json(filepath, compact=False)
+            with open(filepath, "r") as f:
+                self.assertEqual(f.read(), json_str)
+        finally:
+            os.unlink(filepath)
+
     def test_get_states(self):
         """Test retrieving agent states."""
         model = SEIZModel(self.graph, **self.params)
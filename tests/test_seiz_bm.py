@@ -8,18 +8,26 @@ import tempfile
 import unittest
 
 import networkx as nx
+import numpy as np
 
 from seiz_models import SEIZBMModel
+from seiz_models._kernels import NUMBA_AVAILABLE
+
+from .step_paths import STEP_PATHS, assert_fallback_step_runs, assert_step_paths_agree
 
 
 class TestSEIZBMModel(unittest.TestCase):
     """Test cases for SEIZBMModel."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Set up fixtures shared by all tests."""
+        # Create a small test network once; models only attach their agents
+        # (node attribute "agent"), which every new model overwrites
+        cls.graph = nx.erdos_renyi_graph(50, 0.1, seed=42)
+
     def setUp(self):
         """Set up test fixtures."""
-        # Create a small test network
-        self.graph = nx.erdos_renyi_graph(50, 0.1, seed=42)
-
         # Standard parameters
         self.params = {
             "beta": 0.3,
@@ -83,6 +91,18 @@ class TestSEIZBMModel(unittest.TestCase):
         # Total should remain constant
         self.assertEqual(sum(initial_counts.values()), sum(after_counts.values()))
 
+    @unittest.skipUnless(NUMBA_AVAILABLE, "needs numba to compile the kernel")
+    def test_numpy_step_matches_kernel(self):
+        """Test that the NumPy and compiled steps simulate the same process."""
+        model = SEIZBMModel(self.graph, **self.params)
+        assert_step_paths_agree(self, model, steps=10)
+
+    def test_fallback_kernel_step(self):
+        """Test stepping through the kernel run as plain Python, as without numba."""
+        model = SEIZBMModel(self.graph, **self.params)
+        model.initialize_states(infected_frac=0.1, skeptic_frac=0.1, seed=123)
+        assert_fallback_step_runs(self, model)
+
     def test_moderation_effect(self):
         """Test that moderation can convert infected to susceptible."""
         # Use high moderation rate
@@ -104,6 +124,20 @@ class TestSEIZBMModel(unittest.TestCase):
         # With perfect moderation, infected should decrease or stay same
         self.assertLessEqual(final_infected, initial_infected)
 
+    def test_parameter_update(self):
+        """Test that parameters set after construction take effect."""
+        for use_jit in STEP_PATHS:
+            model = SEIZBMModel(self.graph, **self.params)
+            model.use_jit = use_jit
+            model.initialize_states(infected_frac=0.2, skeptic_frac=0.0, seed=123)
+
+            # No new contacts, and every infected agent is moderated back to S
+            model.beta = model.b = 0.0
+            model.mu = model.m = 1.0
+            model.step()
+
+            self.assertEqual(model.count_states()["I"], 0)
+
     def test_run(self):
         """Test running simulation for multiple steps."""
         model = SEIZBMModel(self.graph, **self.params)
@@ -126,6 +160,34 @@ class TestSEIZBMModel(unittest.TestCase):
             total = h["S"] + h["E"] + h["I"] + h["Z"]
             self.assertEqual(total, 50)
 
+    def test_run_ensemble(self):
+        """Test running independent replicates."""
+        history = SEIZBMModel.run_ensemble(
+            self.graph,
+            n_seeds=4,
+            steps=10,
+            infected_frac=0.1,
+            skeptic_frac=0.1,
+            seed=7,
+            **self.params,
+        )
+
+        self.assertEqual(history.shape, (4, 11, 4))
+        self.assertTrue((history.sum(axis=2) == 50).all())
+        self.assertTrue((history[:, 0, 2] == 5).all())
+
+        # Same seed gives the same replicates
+        again = SEIZBMModel.run_ensemble(
+            self.graph,
+            n_seeds=4,
+            steps=10,
+            infected_frac=0.1,
+            skeptic_frac=0.1,
+            seed=7,
+            **self.params,
+        )
+        self.assertTrue((history == again).all())
+
     def test_count_states(self):
         """Test state counting."""
         model = SEIZBMModel(self.graph, **self.params)
@@ -204,6 +266,17 @@ class TestSEIZBMModel(unittest.TestCase):
             agent = self.graph.nodes[node]["agent"]
             self.assertIn(agent.state, ["S", "E", "I", "Z"])
 
+    def test_agent_state_view(self):
+        """Test that agent views read and write the model state."""
+        model = SEIZBMModel(self.graph, **self.params)
+        model.initialize_states(infected_frac=0.0, skeptic_frac=0.0, seed=123)
+
+        node = next(iter(self.graph.nodes()))
+        self.graph.nodes[node]["agent"].state = "I"
+
+        self.assertEqual(model.get_states()[node], "I")
+        self.assertEqual(model.count_states()["I"], 1)
+
 
 if __name__ == "__main__":
     unittest.main()
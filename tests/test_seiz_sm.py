@@ -8,20 +8,36 @@ import tempfile
 import unittest
 
 import networkx as nx
+import numpy as np
 
 from seiz_models import SEIZSMModel
+from seiz_models._kernels import NUMBA_AVAILABLE
+
+from .step_paths import STEP_PATHS, assert_fallback_step_runs, assert_step_paths_agree
+
+
+def _er_csr(n, p, seed):
+    """Sample an Erdos-Renyi graph directly as a CSR adjacency (indptr, indices)."""
+    rng = np.random.default_rng(seed)
+    upper = np.triu(rng.random((n, n)) < p, 1)
+    rows, cols = np.nonzero(upper | upper.T)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+    return indptr, cols
 
 
 class TestSEIZSMModel(unittest.TestCase):
     """Test cases for SEIZSMModel."""
 
-    def setUp(self):
-        """Set up test fixtures."""
-        # Create a small test network
-        self.graph = nx.erdos_renyi_graph(50, 0.1, seed=42)
+    @classmethod
+    def setUpClass(cls):
+        """Set up fixtures shared by all tests."""
+        # Create a small test network once; models only attach their agents
+        # (node attribute "agent"), which every new model overwrites
+        cls.graph = nx.erdos_renyi_graph(50, 0.1, seed=42)
 
-        # Standard parameters
-        self.params = {
+        # Standard parameters; tests override them on a copy
+        cls.params = {
             "beta": 0.3,
             "b": 0.2,
             "rho": 0.2,
@@ -63,6 +79,15 @@ class TestSEIZSMModel(unittest.TestCase):
             self.assertEqual(agent.toxic_messages, 0)
             self.assertEqual(agent.activity_level, 0)
 
+    def test_agent_slots(self):
+        """Test that agents are slotted views without a per-instance dict."""
+        model = SEIZSMModel(self.graph, **self.params)
+        agent = model._agents[0]
+
+        self.assertFalse(hasattr(agent, "__dict__"))
+        with self.assertRaises(AttributeError):
+            agent.profile_cache = agent.profile
+
     def test_initialize_states(self):
         """Test state initialization with fractions."""
         model = SEIZSMModel(self.graph, **self.params)
@@ -80,13 +105,30 @@ class TestSEIZSMModel(unittest.TestCase):
         """Test that same seed produces same initialization."""
         model1 = SEIZSMModel(self.graph, **self.params)
         model1.initialize_states(infected_frac=0.1, skeptic_frac=0.1, seed=42)
-        states1 = model1.get_states()
 
         model2 = SEIZSMModel(self.graph, **self.params)
         model2.initialize_states(infected_frac=0.1, skeptic_frac=0.1, seed=42)
-        states2 = model2.get_states()
 
-        self.assertEqual(states1, states2)
+        self.assertTrue(np.array_equal(model1.state_array, model2.state_array))
+        self.assertEqual(model1.get_states(), model2.get_states())
+
+        # The array view cannot be written to
+        with self.assertRaises(ValueError):
+            model1.state_array[0] = 0
+
+    def test_independent_random_streams(self):
+        """Test that a seeded run does not depend on other models' draws."""
+        alone = SEIZSMModel(self.graph, **self.params)
+        alone.initialize_states(infected_frac=0.1, skeptic_frac=0.1, seed=123)
+        expected = alone.run(steps=10)
+
+        model = SEIZSMModel(self.graph, **self.params)
+        other = SEIZSMModel(self.graph, **self.params)
+        model.initialize_states(infected_frac=0.1, skeptic_frac=0.1, seed=123)
+        other.initialize_states(infected_frac=0.1, skeptic_frac=0.1, seed=7)
+        other.run(steps=10)
+
+        self.assertEqual(model.run(steps=10), expected)
 
     def test_compute_toxicity(self):
         """Test toxicity computation."""
@@ -107,6 +149,49 @@ class TestSEIZSMModel(unittest.TestCase):
         expected = sum(agent.profile) / 3.0
         self.assertAlmostEqual(toxicity, expected)
 
+    def test_toxic_profile_mask(self):
+        """Test that the cached toxic-profile mask matches the threshold test."""
+        model = SEIZSMModel(self.graph, **self.params)
+        model.initialize_states(seed=123)
+
+        for node in self.graph.nodes():
+            agent = self.graph.nodes[node]["agent"]
+            expected = model.compute_toxicity(agent) >= model.T
+            self.assertEqual(bool(model._toxic_profile[agent.idx]), expected)
+
+    def test_toxicity_refreshed_on_initialize(self):
+        """Test that cached toxicities follow the profiles redrawn at initialization."""
+        model = SEIZSMModel(self.graph, **self.params)
+        agent = self.graph.nodes[list(self.graph.nodes())[0]]["agent"]
+
+        model.initialize_states(seed=123)
+        first = model.compute_toxicity(agent)
+        model.initialize_states(seed=456)
+        second = model.compute_toxicity(agent)
+
+        self.assertNotEqual(first, second)
+        self.assertAlmostEqual(second, sum(agent.profile) / 3.0)
+
+    def test_csr_input(self):
+        """Test that a CSR adjacency can replace the NetworkX graph."""
+        model = SEIZSMModel(_er_csr(50, 0.1, seed=42), **self.params)
+        model.initialize_states(infected_frac=0.1, skeptic_frac=0.1, seed=123)
+
+        history = model.run(steps=5)
+        self.assertEqual(len(history), 6)
+        self.assertEqual(sum(history[-1][s] for s in "SEIZ"), 50)
+
+        # Same adjacency and seed as a NetworkX-built model: same simulation
+        reference = SEIZSMModel(self.graph, **self.params)
+        csr_model = SEIZSMModel((reference._indptr, reference._indices), **self.params)
+        for m in (reference, csr_model):
+            m.initialize_states(infected_frac=0.1, skeptic_frac=0.1, seed=123)
+        self.assertEqual(reference.run(steps=5), csr_model.run(steps=5))
+
+        # The NetworkX graph is built on demand, with the agents attached
+        self.assertEqual(csr_model.graph.number_of_edges(), self.graph.number_of_edges())
+        self.assertIs(csr_model.graph.nodes[0]["agent"], csr_model._agents[0])
+
     def test_step(self):
         """Test that step executes without error."""
         model = SEIZSMModel(self.graph, **self.params)
@@ -119,6 +204,55 @@ class TestSEIZSMModel(unittest.TestCase):
         # Total should remain constant
         self.assertEqual(sum(initial_counts.values()), sum(after_counts.values()))
 
+    @unittest.skipUnless(NUMBA_AVAILABLE, "needs numba to compile the kernel")
+    def test_numpy_step_matches_kernel(self):
+        """Test that the NumPy and compiled steps simulate the same process."""
+        # Busy settings: most infected agents send toxic messages every step,
+        # and most contacts expose rather than infect
+        model = SEIZSMModel(self.graph, **dict(self.params, n=25, T=0.3, p=0.2))
+        assert_step_paths_agree(self, model, steps=20)
+
+    def test_fallback_kernel_step(self):
+        """Test stepping through the kernel run as plain Python, as without numba."""
+        # Busy settings: every infected agent sends toxic messages every step,
+        # and most contacts expose rather than infect
+        model = SEIZSMModel(self.graph, **dict(self.params, n=25, T=0.0, p=0.2))
+        model.initialize_states(infected_frac=0.1, skeptic_frac=0.1, seed=123)
+        assert_fallback_step_runs(self, model)
+
+        # Toxic messages were delivered
+        self.assertGreater(model.toxic_sum(), 0)
+
+    def test_internal_transitions(self):
+        """Test that only exposed agents incubate or turn skeptic."""
+        model = SEIZSMModel(self.graph, **dict(self.params, epsilon=1.0))
+        model.initialize_states(infected_frac=0.0, skeptic_frac=0.0, seed=123)
+        nodes = list(self.graph.nodes())
+        for node in nodes[:10]:
+            self.graph.nodes[node]["agent"].state = "E"
+
+        model.internal_transitions()
+        self.assertEqual(model.count_states(), {"S": 40, "E": 0, "I": 10, "Z": 0})
+
+        model = SEIZSMModel(self.graph, **dict(self.params, epsilon=0.0, lambd=1.0))
+        model.initialize_states(infected_frac=0.0, skeptic_frac=0.0, seed=123)
+        for node in nodes[:10]:
+            self.graph.nodes[node]["agent"].state = "E"
+
+        model.internal_transitions()
+        self.assertEqual(model.count_states(), {"S": 40, "E": 0, "I": 0, "Z": 10})
+
+    def test_open_state_counts(self):
+        """Test that the running S and E counts follow every transition."""
+        model = SEIZSMModel(self.graph, **dict(self.params, n=50))
+        model.initialize_states(infected_frac=0.2, skeptic_frac=0.1, seed=123)
+        self.graph.nodes[list(self.graph.nodes())[0]]["agent"].state = "E"
+
+        for _ in range(20):
+            model.step()
+            counts = model.count_states()
+            self.assertEqual((model._n_s, model._n_e), (counts["S"], counts["E"]))
+
     def test_send_messages(self):
         """Test message sending functionality."""
         model = SEIZSMModel(self.graph, **self.params)
@@ -131,10 +265,20 @@ class TestSEIZSMModel(unittest.TestCase):
         self.assertIsInstance(toxic_senders, list)
 
         # At least some agents should have increased activity
-        total_activity = sum(
-            self.graph.nodes[node]["agent"].activity_level for node in self.graph.nodes()
+        self.assertGreater(model.activity_sum(), 0)
+
+    def test_counter_sums(self):
+        """Test that the counter sums match the per-agent counters."""
+        model = SEIZSMModel(self.graph, **self.params)
+        model.initialize_states(infected_frac=0.3, skeptic_frac=0.0, seed=123)
+        model.run(steps=5)
+
+        agents = [self.graph.nodes[node]["agent"] for node in self.graph.nodes()]
+        self.assertEqual(model.activity_sum(), sum(a.activity_level for a in agents))
+        self.assertEqual(model.toxic_sum(), sum(a.toxic_messages for a in agents))
+        self.assertEqual(
+            model.toxic_sum("I"), sum(a.toxic_messages for a in agents if a.state == "I")
         )
-        self.assertGreater(total_activity, 0)
 
     def test_toxic_message_tracking(self):
         """Test that toxic messages are tracked."""
@@ -151,14 +295,23 @@ class TestSEIZSMModel(unittest.TestCase):
             model.step()
 
         # Check that some infected agents have toxic messages
-        total_toxic = sum(
-            self.graph.nodes[node]["agent"].toxic_messages
-            for node in self.graph.nodes()
-            if self.graph.nodes[node]["agent"].state == "I"
-        )
-
         # With T=0, all messages from infected should be toxic
-        self.assertGreater(total_toxic, 0)
+        self.assertGreater(model.toxic_sum("I"), 0)
+
+    def test_parameter_update(self):
+        """Test that parameters set after construction take effect."""
+        for use_jit in STEP_PATHS:
+            model = SEIZSMModel(self.graph, **dict(self.params, T=2.0))
+            model.use_jit = use_jit
+            model.initialize_states(infected_frac=0.4, skeptic_frac=0.0, seed=123)
+
+            # Every message of an infected agent becomes toxic
+            model.T = 0.0
+            model.eta = 0.0
+            model.step()
+
+            self.assertGreater(model.toxic_sum(), 0)
+            self.assertTrue(np.all(model._p_expose == 0.0))
 
     def test_run(self):
         """Test running simulation for multiple steps."""
@@ -182,6 +335,19 @@ class TestSEIZSMModel(unittest.TestCase):
             total = h["S"] + h["E"] + h["I"] + h["Z"]
             self.assertEqual(total, 50)
 
+    def test_run_ensemble(self):
+        """Test running independent replicates."""
+        kwargs = dict(n_seeds=4, steps=10, infected_frac=0.1, skeptic_frac=0.1, seed=7)
+        history = SEIZSMModel.run_ensemble(self.graph, **kwargs, **self.params)
+
+        self.assertEqual(history.shape, (4, 11, 4))
+        self.assertTrue((history.sum(axis=2) == 50).all())
+        self.assertTrue((history[:, 0, 2] == 5).all())
+
+        # Same seed gives the same replicates
+        again = SEIZSMModel.run_ensemble(self.graph, **kwargs, **self.params)
+        self.assertTrue((history == again).all())
+
     def test_count_states(self):
         """Test state counting."""
         model = SEIZSMModel(self.graph, **self.params)